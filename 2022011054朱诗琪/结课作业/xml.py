@@ -5,11 +5,24 @@ from lxml import etree
 from os import path
 from functools import wraps
 import json
+import sys
 
 """
 程序功能：解析完整的xml文件为嵌套字典结构，输出输出 XML 的完整数据树结构（字典格式）。
 """
 
+def elem_to_dict(elem):
+    """
+    递归将 Element 转换成嵌套字典
+    """
+    return {
+        "tag": elem.tag,
+        "attrib": dict(elem.attrib),
+        "text": elem.text.strip() if elem.text and elem.text.strip() else None,
+        "children": [elem_to_dict(child) for child in elem]
+    }
+
+
 def parse_full_xml(file_name):
     """
     装饰器：解析完整 XML 文件为嵌套字典结构，并将其传递给被修饰函数。
@@ -28,15 +41,6 @@ def parse_full_xml(file_name):
                 tree = etree.parse(full_path)
                 root = tree.getroot()
 
-                # 递归将 Element 转换成嵌套字典
-                def elem_to_dict(elem):
-                    return {
-                        "tag": elem.tag,
-                        "attrib": dict(elem.attrib),
-                        "text": elem.text.strip() if elem.text and elem.text.strip() else None,
-                        "children": [elem_to_dict(child) for child in elem]
-                    }
-
                 xml_data_tree = elem_to_dict(root)
                 func(xml_data_tree)
 
@@ -47,6 +51,39 @@ def parse_full_xml(file_name):
     return decorator
 
 
+def stream_xml_records(file_name, record_tag="entry"):
+    """
+    装饰器：流式解析 XML 文件，每遇到一个记录元素（如 UniProt 的 <entry>）就转换成字典，
+    以生成器的形式传递给被修饰函数。处理完的元素立即释放，内存占用与文件大小无关。
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper():
+            full_path = path.join(path.dirname(__file__), file_name)
+
+            if not path.isfile(full_path) or not full_path.endswith(".xml"):
+                raise FileNotFoundError(f"找不到 XML 文件或文件类型不正确: {full_path}")
+
+            def records():
+                # {*} 匹配任意命名空间下的记录标签
+                context = etree.iterparse(full_path, events=("end",), tag="{*}" + record_tag)
+                for event, elem in context:
+                    yield elem_to_dict(elem)
+                    # 释放已处理的记录及其之前的兄弟节点
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+                del context
+
+            try:
+                func(records())
+            except Exception as e:
+                print(f"解析过程中出错：{e}", file=sys.stderr)
+
+        return wrapper
+    return decorator
+
+
 @parse_full_xml("P00734.xml")  # 这里指定 XML 文件名
 def output(data_tree):
     """
@@ -56,5 +93,18 @@ def output(data_tree):
     print(json.dumps(data_tree, indent=2, ensure_ascii=False))
 
 
+@stream_xml_records("P00734.xml")
+def output_json_lines(records):
+    """
+    被修饰函数：每条记录输出一行 JSON（JSON Lines 格式），边解析边输出
+    """
+    for record in records:
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
 if __name__ == "__main__":
-    output()
\ No newline at end of file
+    # python xml.py --jsonl 以 JSON Lines 格式流式输出每条记录
+    if "--jsonl" in sys.argv[1:]:
+        output_json_lines()
+    else:
+        output()
\ No newline at end of file
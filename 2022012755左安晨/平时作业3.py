@@ -60,21 +60,24 @@ def StaticRes(*stat_funcs):
 
 
 @StaticRes("Max", "Min", "AVG", "SUM")
-def dataSampling(**kwargs):
+def dataSampling(rng=None, **kwargs):
+    # rng: 随机数生成器，默认使用 random 模块的全局生成器；传入 random.Random(seed) 可复现结果，
+    # 需要密码学安全的随机数时显式传入 random.SystemRandom()
+    rng = rng or random
     type_, nested_data = list(kwargs.items())[0]
 
     if type_ == "tuple":
-        yield tuple(next(dataSampling.recursive_call(**item)) for item in nested_data)
+        yield tuple(next(dataSampling.recursive_call(rng=rng, **item)) for item in nested_data)
     elif type_ == "list":
-        yield [next(dataSampling.recursive_call(**item)) for item in nested_data]
+        yield [next(dataSampling.recursive_call(rng=rng, **item)) for item in nested_data]
     elif type_ == "dict":
-        yield {key: next(dataSampling.recursive_call(**value)) for key, value in nested_data.items()}
+        yield {key: next(dataSampling.recursive_call(rng=rng, **value)) for key, value in nested_data.items()}
     elif type_ == "int":
-        yield random.randint(nested_data["datarange"][0], nested_data["datarange"][1])
+        yield rng.randint(nested_data["datarange"][0], nested_data["datarange"][1])
     elif type_ == "float":
-        yield random.uniform(nested_data["datarange"][0], nested_data["datarange"][1])
+        yield rng.uniform(nested_data["datarange"][0], nested_data["datarange"][1])
     elif type_ == "str":
-        yield ''.join(random.SystemRandom().choice(nested_data["datarange"]) for _ in range(nested_data["len"]))
+        yield ''.join(rng.choices(nested_data["datarange"], k=nested_data["len"]))
 
 
 # 示例用法
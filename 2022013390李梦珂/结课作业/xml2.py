@@ -11,6 +11,7 @@ XML 文件解析器
 """
 
 import json
+import sys
 from functools import wraps
 from os import path
 from lxml import etree
@@ -58,6 +59,59 @@ def parse_full_xml(xml_filename):
     return decorator
 
 
+def stream_xml_records(xml_filename, record_tag="entry"):
+    """
+    装饰器工厂函数：流式解析 XML 文件，把每个记录元素（如 UniProt 的 <entry>）
+    转换为字典后以生成器的形式传递给被装饰函数，内存占用与文件大小无关
+
+    Args:
+        xml_filename (str): 要解析的 XML 文件名
+        record_tag (str): 记录元素的标签名（不含命名空间）
+
+    Returns:
+        function: 装饰器函数
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # 构建完整文件路径
+            xml_path = path.abspath(path.join(path.dirname(__file__), xml_filename))
+
+            # 验证文件
+            if not path.exists(xml_path):
+                raise FileNotFoundError(f"XML 文件不存在: {xml_path}")
+            if not xml_path.lower().endswith('.xml'):
+                raise ValueError(f"文件类型错误，必须是 .xml 文件: {xml_path}")
+
+            return func(iter_records(xml_path, record_tag), *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def iter_records(xml_path, record_tag="entry"):
+    """
+    逐条产生记录元素对应的字典，处理完的元素立即释放
+
+    Args:
+        xml_path (str): XML 文件路径
+        record_tag (str): 记录元素的标签名（不含命名空间）
+
+    Yields:
+        dict: 与 element_to_dict 结构相同的记录字典
+    """
+    # {*} 匹配任意命名空间下的记录标签
+    context = etree.iterparse(xml_path, events=("end",), tag="{*}" + record_tag)
+    for event, element in context:
+        yield element_to_dict(element)
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+    del context
+
+
 def xml_to_dict(xml_path):
     """
     将 XML 文件转换为嵌套字典结构
@@ -103,5 +157,22 @@ def print_xml_structure(xml_data):
     print(json.dumps(xml_data, indent=2, ensure_ascii=False))
 
 
+@stream_xml_records("P00734.xml")
+def print_json_lines(records, out=sys.stdout):
+    """
+    以 JSON Lines 格式逐条输出记录，边解析边输出
+
+    Args:
+        records (iterator): 记录字典的迭代器
+        out (file): 输出流
+    """
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
 if __name__ == "__main__":
-    print_xml_structure()
\ No newline at end of file
+    # python xml2.py --jsonl 以 JSON Lines 格式流式输出每条记录
+    if "--jsonl" in sys.argv[1:]:
+        print_json_lines()
+    else:
+        print_xml_structure()
\ No newline at end of file
@@ -11,6 +11,7 @@ XML解析器：将XML文件转换为嵌套字典结构并输出完整数据树
 """
 
 import json
+import sys
 from functools import wraps
 from os import path
 from lxml import etree
@@ -61,6 +62,37 @@ class XMLParser:
 
         return result
 
+    @staticmethod
+    def iter_records(xml_file, record_tag='entry'):
+        """
+        流式解析XML文件，逐条产生记录元素（如 UniProt 的 <entry>）对应的字典，
+        处理完的元素立即释放，内存占用与文件大小无关
+
+        参数:
+            xml_file (str): XML文件路径
+            record_tag (str): 记录元素的标签名（不含命名空间）
+
+        返回:
+            iterator: 与 parse_to_dict 结构相同的记录字典
+
+        异常:
+            FileNotFoundError: 文件不存在
+            ValueError: 文件不是XML格式
+        """
+        if not path.isfile(xml_file):
+            raise FileNotFoundError(f"文件不存在: {xml_file}")
+        if not xml_file.lower().endswith('.xml'):
+            raise ValueError(f"文件不是XML格式: {xml_file}")
+
+        # {*} 匹配任意命名空间下的记录标签
+        context = etree.iterparse(xml_file, events=('end',), tag='{*}' + record_tag)
+        for event, element in context:
+            yield XMLParser._element_to_dict(element)
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+        del context
+
 
 def xml_file_parser(file_name):
     """
@@ -88,6 +120,26 @@ def xml_file_parser(file_name):
     return decorator
 
 
+def stream_xml_records(file_name, record_tag='entry'):
+    """
+    装饰器：流式解析XML文件，把记录字典的迭代器传递给被装饰函数
+
+    参数:
+        file_name (str): 要解析的XML文件名
+        record_tag (str): 记录元素的标签名（不含命名空间）
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            full_path = path.join(path.dirname(__file__), file_name)
+            return func(XMLParser.iter_records(full_path, record_tag), *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
 @xml_file_parser("P00734.xml")
 def print_xml_structure(data_tree):
     """
@@ -100,5 +152,21 @@ def print_xml_structure(data_tree):
     print(json.dumps(data_tree, indent=2, ensure_ascii=False))
 
 
+@stream_xml_records("P00734.xml")
+def print_json_lines(records):
+    """
+    以JSON Lines格式逐条输出记录，边解析边输出
+
+    参数:
+        records (iterator): 记录字典的迭代器
+    """
+    for record in records:
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
 if __name__ == "__main__":
-    print_xml_structure()
\ No newline at end of file
+    # python xml3.py --jsonl 以JSON Lines格式流式输出每条记录
+    if "--jsonl" in sys.argv[1:]:
+        print_json_lines()
+    else:
+        print_xml_structure()
\ No newline at end of file
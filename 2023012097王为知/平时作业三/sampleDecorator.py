@@ -6,38 +6,124 @@
 
 import random
 import string
+import threading
 from functools import wraps
+from itertools import chain
 import atexit
 
-# 全局变量用于存储所有样本的数值
-all_numbers = []
-
-def extract_numbers(data):
+def extract_numbers(data, out=None):
     """
-    递归提取数据结构中的所有数值（整数和浮点数）
+    提取数据结构中的所有数值（整数和浮点数），按深度优先顺序排列
+    
+    用显式栈代替递归，嵌套再深也不会超出递归深度限制；所有数值直接追加到同一个缓冲区，
+    不再为每一层嵌套构造并拷贝临时列表
     
     参数:
     data: 任意数据结构（支持嵌套）
+    out: 追加数值的缓冲区，默认新建列表；也可传入 array('d') 等支持 append 的对象
     
     返回:
-    list: 提取到的数值列表
+    提取到数值的缓冲区（即 out）
     """
-    numbers = []
-    if isinstance(data, (int, float)):
-        numbers.append(data)
-    elif isinstance(data, (list, tuple)):
-        for item in data:
-            numbers.extend(extract_numbers(item))
-    elif isinstance(data, dict):
-        for key, value in data.items():
-            numbers.extend(extract_numbers(key))
-            numbers.extend(extract_numbers(value))
+    numbers = [] if out is None else out
+    append = numbers.append
+    stack = [iter((data,))]
+    while stack:
+        for item in stack[-1]:
+            cls = type(item)
+            # 快速路径：先按精确类型判断，最常见的情况不必走 isinstance
+            if cls is int or cls is float:
+                append(item)
+            elif cls is list or cls is tuple:
+                stack.append(iter(item))
+                break
+            elif cls is dict:
+                stack.append(chain.from_iterable(item.items()))
+                break
+            elif isinstance(item, (int, float)):
+                append(item)
+            elif isinstance(item, (list, tuple)):
+                stack.append(iter(item))
+                break
+            elif isinstance(item, dict):
+                stack.append(chain.from_iterable(item.items()))
+                break
+        else:
+            stack.pop()
     return numbers
 
+class RunningStatistics:
+    """
+    常数内存的流式统计累加器
+    
+    只保存数量、总和、均值、M2（Welford 算法）、最大值和最小值，
+    不保存原始数值；内部加锁，多个生成器在不同线程中同时运行时也能安全累加。
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.max = None
+        self.min = None
+    
+    def update(self, values):
+        """
+        累加一批数值：先在锁外算出这批数值的局部统计量，再在锁内与全局统计量合并
+        
+        参数:
+        values (list): 数值列表
+        """
+        n = len(values)
+        if n == 0:
+            return
+        total = sum(values)
+        mean = total / n
+        m2 = sum((x - mean) ** 2 for x in values)
+        high, low = max(values), min(values)
+        
+        with self._lock:
+            count = self.count + n
+            delta = mean - self.mean
+            # 合并两组数据的均值和 M2（Welford/Chan 并行公式）
+            self.m2 += m2 + delta * delta * self.count * n / count
+            self.mean += delta * n / count
+            self.count = count
+            self.total += total
+            self.max = high if self.max is None else max(self.max, high)
+            self.min = low if self.min is None else min(self.min, low)
+    
+    def result(self, operations):
+        """
+        读取当前统计结果，可在生成过程中随时调用
+        
+        参数:
+        operations (list): 需要的统计操作（可选'SUM','AVG','MAX','MIN','VAR'）
+        
+        返回:
+        dict: 统计操作名到结果的映射，尚无数据时为空字典
+        """
+        with self._lock:
+            if self.count == 0:
+                return {}
+            values = {
+                'SUM': self.total,
+                'AVG': self.mean,
+                'MAX': self.max,
+                'MIN': self.min,
+                'VAR': self.m2 / self.count,
+            }
+        return {op: values[op] for op in operations if op in values}
+
 def statistics_decorator(operations):
     """
     带参装饰器工厂函数，用于添加全局统计功能
     
+    被修饰的生成器每产生一个样本，就把其中的数值累加到 wrapper.stats
+    （RunningStatistics 实例）中，内存占用与样本数量无关。
+    
     参数:
     operations (list): 包含统计操作名的列表（可选'SUM','AVG','MAX','MIN'）
     
@@ -45,24 +131,32 @@ def statistics_decorator(operations):
     decorator: 装饰器函数
     """
     def decorator(func):
+        stats = RunningStatistics()
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             gen = func(*args, **kwargs)
+            buffer = []
             for sample in gen:
-                # 提取当前样本中的所有数值并添加到全局列表
-                all_numbers.extend(extract_numbers(sample))
+                # 提取当前样本中的所有数值并累加到统计量（复用同一个缓冲区）
+                buffer.clear()
+                stats.update(extract_numbers(sample, buffer))
                 yield sample
+        wrapper.stats = stats
+        wrapper.operations = operations
         return wrapper
     return decorator
 
-def print_global_statistics(operations):
+def print_global_statistics(operations, stats):
     """
     打印全局统计结果
     
     参数:
     operations (list): 需要执行的统计操作列表
+    stats (RunningStatistics): 被修饰生成器的统计累加器（即 wrapper.stats）
     """
-    if not all_numbers:
+    results = stats.result(operations)
+    if not results:
         print("没有收集到任何数值数据")
         return
     
@@ -70,54 +164,47 @@ def print_global_statistics(operations):
     print("全局统计结果（所有样本）：")
     print("="*50)
     
-    stats = {}
-    if 'SUM' in operations:
-        stats['SUM'] = sum(all_numbers)
-    if 'AVG' in operations:
-        stats['AVG'] = sum(all_numbers) / len(all_numbers)
-    if 'MAX' in operations:
-        stats['MAX'] = max(all_numbers)
-    if 'MIN' in operations:
-        stats['MIN'] = min(all_numbers)
-    
-    for op, value in stats.items():
+    for op, value in results.items():
         print(f"{op}: {value:.4f}" if isinstance(value, float) else f"{op}: {value}")
     
-    print(f"统计样本数量: {len(all_numbers)}个数值")
+    print(f"统计样本数量: {stats.count}个数值")
     print("="*50)
 
-def generator_sample(kwargs):
+def generator_sample(kwargs, rng=None):
     """
     根据给定的结构规范生成单个样本数据
     
     参数:
     kwargs (dict): 描述数据结构的字典，键为数据类型，值为该类型的生成规则
+    rng (random.Random): 随机数生成器，默认使用 random 模块的全局生成器；
+        传入 random.Random(seed) 可复现结果，需要密码学安全的随机数时显式传入 random.SystemRandom()
     
     返回:
     list: 生成的样本数据列表
     """
+    rng = rng or random
     res = list()
     for k, v in kwargs.items():
         if k == 'num':
             continue
         elif k is int:
             it = iter(v['datarange'])
-            res.append(random.randint(next(it), next(it)))
+            res.append(rng.randint(next(it), next(it)))
         elif k is float:
             it = iter(v['datarange'])
-            res.append(random.uniform(next(it), next(it)))
+            res.append(rng.uniform(next(it), next(it)))
         elif k is str:
             datarange, length = v['datarange'], v['len']
-            tmp = ''.join(random.SystemRandom().choice(datarange) for _ in range(length))
+            tmp = ''.join(rng.choices(datarange, k=length))
             res.append(tmp)
         elif k is dict:
             elem = dict()
-            elem[random.randint(0, 10)] = random.randint(0, 10)
+            elem[rng.randint(0, 10)] = rng.randint(0, 10)
             res.append(elem)
         elif k is list:
-            res.append(generator_sample(v))
+            res.append(generator_sample(v, rng))
         elif k is tuple:
-            res.append(tuple(generator_sample(v)))
+            res.append(tuple(generator_sample(v, rng)))
         else:
             continue
     return res
@@ -126,25 +213,26 @@ def generator_sample(kwargs):
 OPERATIONS = ['SUM', 'AVG', 'MAX', 'MIN']
 
 @statistics_decorator(operations=OPERATIONS)
-def generate(kwargs):
+def generate(kwargs, rng=None):
     """
     生成器函数，根据给定结构无限生成样本数据（已添加统计装饰器）
     
     参数:
     kwargs (dict): 描述数据结构的字典
+    rng (random.Random): 随机数生成器，规则与 generator_sample 相同
     
     返回:
     generator: 生成样本数据的生成器
     """
     while True:
-        yield generator_sample(kwargs)
+        yield generator_sample(kwargs, rng)
 
 def main():
     """
     主函数：定义数据结构并生成10000个样本数据
     """
     # 注册退出处理函数，在程序结束时打印全局统计
-    atexit.register(print_global_statistics, OPERATIONS)
+    atexit.register(print_global_statistics, OPERATIONS, generate.stats)
     
     struct = {
         tuple: {
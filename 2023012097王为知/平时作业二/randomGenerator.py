@@ -4,19 +4,26 @@
 @Description: 使用生成器生成随机样本，配套生成器使用范例代码，随机样本的数量和结构由调用者输入。
 """
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import hashlib
+import os
 import random
 import string
 
-def generator_sample(kwargs):
+def generator_sample(kwargs, rng=None):
     """
     根据给定的结构规范生成单个样本数据
     
     参数:
     kwargs (dict): 描述数据结构的字典，键为数据类型，值为该类型的生成规则
+    rng (random.Random): 随机数生成器，默认使用 random 模块的全局生成器；
+        传入 random.Random(seed) 可复现结果，需要密码学安全的随机数时显式传入 random.SystemRandom()
     
     返回:
     list: 生成的样本数据列表
     """
+    rng = rng or random
     res = list()
     for k, v in kwargs.items():
         # 跳过总数量控制参数
@@ -25,43 +32,209 @@ def generator_sample(kwargs):
         # 生成整数类型数据
         elif k is int:
             it = iter(v['datarange'])
-            res.append(random.randint(next(it), next(it)))
+            res.append(rng.randint(next(it), next(it)))
         # 生成浮点数类型数据
         elif k is float:
             it = iter(v['datarange'])
-            res.append(random.uniform(next(it), next(it)))
+            res.append(rng.uniform(next(it), next(it)))
         # 生成字符串类型数据
         elif k is str:
             datarange, length = v['datarange'], v['len']
-            tmp = ''.join(random.SystemRandom().choice(datarange) for _ in range(length))
+            tmp = ''.join(rng.choices(datarange, k=length))
             res.append(tmp)
         # 生成字典类型数据（固定结构：随机整数键值对）
         elif k is dict:
             elem = dict()
-            elem[random.randint(0, 10)] = random.randint(0, 10)
+            elem[rng.randint(0, 10)] = rng.randint(0, 10)
             res.append(elem)
         # 生成列表类型数据（递归调用）
         elif k is list:
-            res.append(generator_sample(v))
+            res.append(generator_sample(v, rng))
         # 生成元组类型数据（递归调用并转换为元组）
         elif k is tuple:
-            res.append(tuple(generator_sample(v)))
+            res.append(tuple(generator_sample(v, rng)))
         else:
             continue
     return res
 
-def generate(kwargs):
+def bulk_strings(chars, length, n, rng=None):
+    """
+    一次生成 n 个长度为 length 的随机字符串：整批字符的随机字节一次抽出，
+    经 bytes.translate 查表映射为字符后再切分，不再逐字符调用 Python 函数
+    
+    参数:
+    chars (str): 字符取值范围
+    length (int): 每个字符串的长度
+    n (int): 字符串个数
+    rng (random.Random): 随机数生成器，规则与 generator_sample 相同
+    
+    返回:
+    list: n 个字符串
+    """
+    rng = rng or random
+    total = n * length
+    if not total:
+        return [''] * n
+    try:
+        encoded = chars.encode('latin-1')
+    except UnicodeEncodeError:
+        encoded = None
+    # 字符超出单字节范围、取值范围超过 256 个字符或生成器不支持 randbytes 时，退回逐字符抽取
+    if encoded is None or not 0 < len(encoded) <= 256 or not hasattr(rng, 'randbytes'):
+        text = ''.join(rng.choices(chars, k=total))
+    else:
+        m = len(encoded)
+        # 字节值 b 映射为 chars[b % m]；limit 及以上的字节直接丢弃，保证每个字符等概率
+        limit = 256 - 256 % m
+        table = bytes(encoded[b % m] for b in range(256))
+        reject = bytes(range(limit, 256))
+        data = b''
+        while len(data) < total:
+            need = total - len(data)
+            data += rng.randbytes(need * 256 // limit + 16).translate(table, reject)
+        text = data[:total].decode('latin-1')
+    return [text[i:i + length] for i in range(0, total, length)]
+
+def _string_pool(chars, length, rng, batch=1024):
+    """
+    按批调用 bulk_strings，逐个取出字符串（供 compile_sample 的闭包使用）
+    """
+    while True:
+        yield from bulk_strings(chars, length, batch, rng)
+
+def compile_sample(kwargs, rng=None):
+    """
+    将结构规范预编译为闭包树，生成时不再重复解析规范字典
+    
+    参数:
+    kwargs (dict): 描述数据结构的字典，规则与 generator_sample 相同
+    rng (random.Random): 随机数生成器，规则与 generator_sample 相同
+    
+    返回:
+    function: 无参函数，每次调用生成一个与 generator_sample 结构相同的样本
+    """
+    rng = rng or random
+    makers = []
+    for k, v in kwargs.items():
+        # 跳过总数量控制参数
+        if k == 'num':
+            continue
+        # 整数、浮点数：预先取出取值范围并算好跨度，绑定到闭包参数上
+        # （整数直接由 random() 缩放得到，省去 randint 每次的参数检查）
+        elif k is int:
+            it = iter(v['datarange'])
+            lo, hi = next(it), next(it)
+            makers.append(lambda lo=lo, span=hi - lo + 1, rand=rng.random: lo + int(rand() * span))
+        elif k is float:
+            it = iter(v['datarange'])
+            lo, hi = next(it), next(it)
+            makers.append(lambda lo=lo, span=hi - lo, rand=rng.random: lo + span * rand())
+        # 字符串：按批生成后逐个取出
+        elif k is str:
+            makers.append(_string_pool(v['datarange'], v['len'], rng).__next__)
+        # 字典（固定结构：随机整数键值对）
+        elif k is dict:
+            makers.append(lambda rand=rng.random: {int(rand() * 11): int(rand() * 11)})
+        # 列表、元组：递归编译子结构
+        elif k is list:
+            makers.append(compile_sample(v, rng))
+        elif k is tuple:
+            makers.append(lambda inner=compile_sample(v, rng): tuple(inner()))
+        else:
+            continue
+    makers = tuple(makers)
+    return lambda: [make() for make in makers]
+
+def generate(kwargs, rng=None):
     """
     生成器函数，根据给定结构无限生成样本数据
     
     参数:
     kwargs (dict): 描述数据结构的字典
+    rng (random.Random): 随机数生成器，规则与 generator_sample 相同
     
     返回:
     generator: 生成样本数据的生成器
     """
+    sample = compile_sample(kwargs, rng)
     while True:
-        yield generator_sample(kwargs)
+        yield sample()
+
+def chunk_seed(seed, index):
+    """
+    由主种子和分块序号派生该分块的独立种子（SHA-256 散列，各分块的随机序列互不相关）
+    
+    参数:
+    seed (int): 主种子
+    index (int): 分块序号
+    
+    返回:
+    int: 128 位分块种子
+    """
+    digest = hashlib.sha256(f"{seed}:{index}".encode('ascii')).digest()
+    return int.from_bytes(digest[:16], 'little')
+
+def _portable(kwargs):
+    """
+    去掉结构规范中的函数（如 constraint 约束，生成时并不使用），
+    使规范可以被序列化后传给子进程
+    """
+    if not isinstance(kwargs, dict):
+        return kwargs
+    return {k: _portable(v) for k, v in kwargs.items() if not callable(v) or isinstance(k, type)}
+
+def _generate_chunk(kwargs, seed, count):
+    """
+    在子进程中生成一个分块（必须是模块级函数，才能被进程池序列化）
+    """
+    sample = compile_sample(kwargs, random.Random(seed))
+    return [sample() for _ in range(count)]
+
+def generate_parallel(kwargs, num, seed=0, processes=None, ordered=True, chunk_size=10000):
+    """
+    多进程生成 num 个样本：按 chunk_size 分块交给进程池，每个分块使用由主种子派生的独立种子，
+    因此同一种子下生成的样本完全相同，与进程数无关
+    
+    参数:
+    kwargs (dict): 描述数据结构的字典，规则与 generator_sample 相同
+    num (int): 样本总数
+    seed (int): 主种子
+    processes (int): 进程数，默认为 CPU 核数；为 1 时在当前进程中依次生成
+    ordered (bool): True 时按分块顺序返回；False 时哪个分块先完成先返回（只有块内顺序固定）
+    chunk_size (int): 每个分块的样本数
+    
+    返回:
+    generator: 逐个产生样本的生成器；同时在途的分块数有上限，内存占用不随 num 增长
+    """
+    spec = _portable(kwargs)
+    chunks = [(chunk_seed(seed, i), min(chunk_size, num - start))
+              for i, start in enumerate(range(0, num, chunk_size))]
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        for child_seed, count in chunks:
+            yield from _generate_chunk(spec, child_seed, count)
+        return
+
+    window = processes * 2
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = iter(chunks)
+        inflight = deque()
+        for child_seed, count in pending:
+            inflight.append(pool.submit(_generate_chunk, spec, child_seed, count))
+            if len(inflight) >= window:
+                break
+        while inflight:
+            if ordered:
+                done = inflight.popleft()
+            else:
+                finished, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                done = next(future for future in inflight if future in finished)
+                inflight.remove(done)
+            # 取走一个分块就补交一个，保持进程池忙碌
+            for child_seed, count in pending:
+                inflight.append(pool.submit(_generate_chunk, spec, child_seed, count))
+                break
+            yield from done.result()
 
 def main():
     """
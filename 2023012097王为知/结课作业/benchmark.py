@@ -0,0 +1,494 @@
+"""
+@Author: Weizhi Wang
+@Date: 2025-06-03
+@Description: 大型 XML 解析器基准测试：生成指定大小的 UniProt 结构 XML 文件，
+              依次运行仓库中各 largeXMLDealer / LargeXMLParser 变体，输出吞吐量与内存对比表
+"""
+
+import argparse
+import ast
+import glob
+import importlib.util
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from os import path
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# 生成文件中的根元素开始/结束部分，与 UniProt 发布文件一致
+_HEADER = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+           '<uniprot xmlns="http://uniprot.org/uniprot" '
+           'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+           'xsi:schemaLocation="http://uniprot.org/uniprot http://www.uniprot.org/support/docs/uniprot.xsd">\n')
+_FOOTER = ('<copyright>\nCopyrighted by the UniProt Consortium, see https://www.uniprot.org/terms\n'
+           'Distributed under the Creative Commons Attribution (CC BY 4.0) License\n</copyright>\n</uniprot>\n')
+# 生成记录时使用的不同记录模板数，记录之间只有 accession 和 name 不同
+_TEMPLATES = 64
+_AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+_ORGANISMS = [('Homo sapiens', 'Human', 9606), ('Mus musculus', 'Mouse', 10090),
+              ('Rattus norvegicus', 'Rat', 10116), ('Bos taurus', 'Bovine', 9913)]
+_WORDS = ('protein kinase binding domain receptor activity thrombin serine protease '
+          'coagulation factor membrane signal peptide cleavage region chain').split()
+# 元素开始标签（不含结束标签、注释和处理指令），用于统计模板中的元素数
+_START_TAG = re.compile(r'<[A-Za-z]')
+
+
+def parse_size(text):
+    """把 100M / 1G / 20G / 1048576 这样的大小转换为字节数"""
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    text = text.strip().upper().rstrip('B')
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def _sentence(rng, words):
+    return ' '.join(rng.choice(_WORDS) for _ in range(words)).capitalize()
+
+
+def _accession(n):
+    """按序号生成 UniProt 格式的 accession（如 P00734、Q9Y2K1）"""
+    letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    digits = '0123456789'
+    return (('OPQ'[n % 3]) + digits[n // 3 % 10] + letters[n // 30 % 26]
+            + letters[n // 780 % 26] + digits[n // 20280 % 10] + str(n // 202800))
+
+
+def _entry_template(rng):
+    """
+    生成一个记录模板（entry 中 accession 和 name 之后的全部内容）
+    :return: (模板, 元素数)
+    """
+    organism, common, taxid = rng.choice(_ORGANISMS)
+    length = rng.randint(100, 1500)
+    parts = ['<protein>\n<recommendedName>\n<fullName>', _sentence(rng, 3), '</fullName>\n'
+             '</recommendedName>\n</protein>\n<gene>\n<name type="primary">',
+             ''.join(rng.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=3)), str(rng.randint(1, 20)),
+             '</name>\n</gene>\n<organism>\n<name type="scientific">', organism,
+             f'</name>\n<name type="common">{common}</name>\n'
+             f'<dbReference type="NCBI Taxonomy" id="{taxid}"/>\n<lineage>\n']
+    for taxon in ('Eukaryota', 'Metazoa', 'Chordata', 'Craniata', 'Vertebrata', 'Mammalia'):
+        parts.append(f'<taxon>{taxon}</taxon>\n')
+    parts.append('</lineage>\n</organism>\n')
+    for key in range(1, rng.randint(3, 12)):
+        parts.append(f'<reference key="{key}">\n<citation type="journal article" date="{rng.randint(1980, 2024)}" '
+                     f'name="J. Biol. Chem." volume="{rng.randint(1, 300)}" first="{rng.randint(1, 9000)}">\n'
+                     f'<title>{_sentence(rng, 8)}.</title>\n<authorList>\n')
+        for _ in range(rng.randint(2, 8)):
+            parts.append(f'<person name="{rng.choice(_WORDS).capitalize()} {rng.choice(_WORDS)[0].upper()}."/>\n')
+        parts.append(f'</authorList>\n<dbReference type="PubMed" id="{rng.randint(1000000, 39999999)}"/>\n'
+                     f'</citation>\n<scope>{_sentence(rng, 4).upper()}</scope>\n</reference>\n')
+    for kind in ('function', 'subcellular location', 'similarity'):
+        parts.append(f'<comment type="{kind}">\n<text>{_sentence(rng, 12)}.</text>\n</comment>\n')
+    for _ in range(rng.randint(5, 40)):
+        parts.append(f'<dbReference type="{rng.choice(["PDB", "EMBL", "RefSeq", "GO", "InterPro"])}" '
+                     f'id="{rng.randint(10000, 99999)}">\n'
+                     f'<property type="entry name" value="{rng.choice(_WORDS)}"/>\n</dbReference>\n')
+    for _ in range(rng.randint(2, 10)):
+        parts.append(f'<keyword id="KW-{rng.randint(1, 9999):04d}">{rng.choice(_WORDS).capitalize()}</keyword>\n')
+    for _ in range(rng.randint(3, 30)):
+        begin = rng.randint(1, length)
+        end = rng.randint(begin, length)
+        parts.append(f'<feature type="{rng.choice(["chain", "domain", "binding site", "sequence variant"])}" '
+                     f'description="{_sentence(rng, 3)}">\n<location>\n<begin position="{begin}"/>\n'
+                     f'<end position="{end}"/>\n</location>\n</feature>\n')
+    parts.append(f'<sequence length="{length}" mass="{length * 110 + rng.randint(0, 999)}" '
+                 f'checksum="{rng.getrandbits(64):016X}" modified="2007-01-23" version="{rng.randint(1, 5)}">'
+                 f'{"".join(rng.choices(_AMINO_ACIDS, k=length))}</sequence>\n</entry>\n')
+    template = ''.join(parts)
+    return template, len(_START_TAG.findall(template))
+
+
+def generate_uniprot_xml(fileName, size, seed=0):
+    """
+    生成 UniProt 结构的 XML 文件，内容只由 size 和 seed 决定；
+    旁路文件 <fileName>.json 记录记录数、元素数等信息，参数相同时直接复用已生成的文件
+    :param fileName: 输出文件路径
+    :param size: 目标字节数（生成结果略大于该值，以完整记录结束）
+    :param seed: 随机种子
+    :return: 文件信息 {'size', 'seed', 'bytes', 'entries', 'elements'}
+    """
+    metaFile = fileName + '.json'
+    if path.isfile(fileName) and path.isfile(metaFile):
+        with open(metaFile, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta['size'] == size and meta['seed'] == seed and meta['bytes'] == path.getsize(fileName):
+            return meta
+
+    rng = random.Random(seed)
+    templates = [_entry_template(rng) for _ in range(_TEMPLATES)]
+    written = entries = 0
+    # 根元素和 copyright 元素
+    elements = 2
+    with open(fileName, 'w', encoding='utf-8', newline='\n') as f:
+        written += f.write(_HEADER)
+        while written < size:
+            body, count = templates[rng.randrange(_TEMPLATES)]
+            accessions = ''.join(f'<accession>{_accession(entries * 3 + i)}</accession>\n'
+                                 for i in range(rng.randint(1, 3)))
+            written += f.write(f'<entry dataset="Swiss-Prot" created="2000-05-30" modified="2024-07-24" '
+                               f'version="{rng.randint(1, 300)}">\n{accessions}'
+                               f'<name>P{entries:07d}_{rng.choice(_ORGANISMS)[1].upper()}</name>\n{body}')
+            elements += count + accessions.count('<accession>') + 2
+            entries += 1
+        written += f.write(_FOOTER)
+
+    meta = {'size': size, 'seed': seed, 'bytes': path.getsize(fileName), 'entries': entries, 'elements': elements}
+    with open(metaFile, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def _arguments(func):
+    """
+    函数定义中除 self 以外的位置参数
+    :return: (参数名列表, 没有默认值的参数个数)
+    """
+    args = [arg.arg for arg in func.args.args[1:]]
+    return args, len(args) - len(func.args.defaults)
+
+
+def _is_tag(name):
+    """按参数名判断是否为标签参数（elemTag、tag_name、target_element 等）"""
+    name = name.lower()
+    return 'tag' in name or name.endswith('element') and not name.startswith('func')
+
+
+def _parse_file(fileName):
+    """读取并解析源文件的语法树，无法解析时返回 None"""
+    try:
+        with open(fileName, encoding='utf-8') as f:
+            return ast.parse(f.read())
+    except (SyntaxError, UnicodeDecodeError, ValueError):
+        return None
+
+
+def _decorator_signature(tree, name):
+    """
+    分析模块级装饰器函数 name 的调用方式：
+    装饰器（或 @name() 形式的装饰器工厂返回的装饰器）返回的包装函数按
+    wrapper(xml, tag) 的位置参数调用，或按 wrapper(文件参数=xml, 标签参数=tag) 的关键字参数调用，
+    关键字参数名取自包装函数中 kwargs.get('...') / kwargs['...'] 读取的键
+    :return: (是否为装饰器工厂, None 或 (文件参数名, 标签参数名))，无法统一调用时返回 None
+    """
+    funcs = {node.name: node for node in tree.body if isinstance(node, ast.FunctionDef)}
+    if name not in funcs:
+        return None
+    # 模块中使用该装饰器的方式：@name 或 @name()
+    usages = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for d in node.decorator_list:
+            if isinstance(d, ast.Name) and d.id == name:
+                usages.add(False)
+            elif isinstance(d, ast.Call) and isinstance(d.func, ast.Name) and d.func.id == name:
+                # 只支持不带参数的装饰器工厂
+                usages.add(True if not d.args and not d.keywords else None)
+    if len(usages) != 1 or None in usages:
+        return None
+    factory = usages.pop()
+    decorator = funcs[name]
+    if factory:
+        decorator = next((n for n in decorator.body if isinstance(n, ast.FunctionDef)), None)
+    if decorator is None or len(decorator.args.args) != 1:
+        return None
+    wrapper = next((n for n in decorator.body if isinstance(n, ast.FunctionDef)), None)
+    if wrapper is None:
+        return None
+
+    args = [arg.arg for arg in wrapper.args.args]
+    if len(args) >= 2 and len(args) - len(wrapper.args.defaults) <= 2 and _is_tag(args[1]):
+        return factory, None
+    if wrapper.args.kwarg is None:
+        return None
+    kwargs = wrapper.args.kwarg.arg
+    keys = []
+    for node in ast.walk(wrapper):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'get'
+                and isinstance(node.func.value, ast.Name) and node.func.value.id == kwargs):
+            key = node.args[0] if node.args else None
+        elif isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name) and node.value.id == kwargs:
+            key = node.slice
+        else:
+            continue
+        if isinstance(key, ast.Constant) and isinstance(key.value, str) and key.value not in keys:
+            keys.append(key.value)
+    file_key = next((k for k in keys if 'file' in k.lower() and 'out' not in k.lower()), None)
+    tag_key = next((k for k in keys if _is_tag(k)), None)
+    if file_key is None or tag_key is None:
+        return None
+    return factory, (file_key, tag_key)
+
+
+def find_entry_points(fileName):
+    """
+    用语法树识别文件中可基准测试的入口（不导入模块），按参数个数和参数名判断调用方式：
+      parse     - Cls().parse(xml, tag, func) / Cls(xml, tag).parse(xml, tag, func) / Cls().parse(xml, func)
+      __call__  - Cls(xml, tag)(func)() / Cls(func)(xml, tag)
+      decorator - 模块级装饰器 @deco / @deco()：deco(func)(xml, tag) 或 deco(func)(file=xml, tag=tag)，
+                  关键字参数名见 _decorator_signature
+      analyze   - XMLStructureAnalyzer(xml).analyze()
+    其他形式的接口无法统一调用，不参与测试
+    :return: [(类名或装饰器名, 调用方式), ...]，调用方式见 _run_entry
+    """
+    tree = _parse_file(fileName)
+    if tree is None:
+        return []
+    entries = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        methods = {m.name: m for m in node.body if isinstance(m, ast.FunctionDef)}
+        init, init_required = _arguments(methods['__init__']) if '__init__' in methods else ([], 0)
+        # 构造参数为 (文件, 标签) 形式
+        init_file_tag = len(init) >= 2 and init_required <= 2 and _is_tag(init[1])
+        if 'parse' in methods:
+            parse, parse_required = _arguments(methods['parse'])
+            if len(parse) >= 3 and parse_required <= 3 and _is_tag(parse[1]):
+                if init_required == 0:
+                    entries.append((node.name, 'parse3'))
+                elif init_file_tag:
+                    entries.append((node.name, 'parse3_init'))
+            elif len(parse) >= 2 and parse_required <= 2 and not _is_tag(parse[1]) and init_required == 0:
+                entries.append((node.name, 'parse2'))
+        if '__call__' in methods:
+            call, call_required = _arguments(methods['__call__'])
+            if init_file_tag and len(call) >= 1 and call_required <= 1:
+                entries.append((node.name, 'call_init'))
+            elif init_required == 1 and len(call) >= 2 and call_required <= 2 and _is_tag(call[1]):
+                entries.append((node.name, 'call_func'))
+        if node.name == 'XMLStructureAnalyzer' and 'analyze' in methods and init_required == 1:
+            entries.append((node.name, 'analyze'))
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and _decorator_signature(tree, node.name):
+            entries.append((node.name, 'decorator'))
+    return entries
+
+
+def discover(root, match=None):
+    """
+    在 root 下查找所有解析器变体（文件名或类名与大型 XML 解析相关的模块）
+    :param match: 只保留路径中包含该字符串的文件
+    :return: [(文件路径, 类名, 调用方式), ...]
+    """
+    found = []
+    for fileName in sorted(glob.glob(path.join(root, '**', '*.py'), recursive=True)):
+        if path.abspath(fileName) == path.abspath(__file__):
+            continue
+        if match and match not in fileName:
+            continue
+        for cls, kind in find_entry_points(fileName):
+            found.append((fileName, cls, kind))
+    return found
+
+
+def _run_entry(module, cls, kind, xmlFile, tag, callback):
+    """按 find_entry_points 识别出的调用方式运行一次解析"""
+    Cls = getattr(module, cls)
+    if kind == 'decorator':
+        factory, keywords = _decorator_signature(_parse_file(module.__file__), cls)
+        wrapper = (Cls() if factory else Cls)(callback)
+        if keywords:
+            wrapper(**{keywords[0]: xmlFile, keywords[1]: tag})
+        else:
+            wrapper(xmlFile, tag)
+        return
+    if kind == 'parse3':
+        Cls().parse(xmlFile, tag, callback)
+    elif kind == 'parse3_init':
+        Cls(xmlFile, tag).parse(xmlFile, tag, callback)
+    elif kind == 'parse2':
+        Cls().parse(xmlFile, callback)
+    elif kind == 'call_init':
+        wrapper = Cls(xmlFile, tag)(callback)
+        if callable(wrapper):
+            wrapper()
+    elif kind == 'call_func':
+        Cls(callback)(xmlFile, tag)
+    elif kind == 'analyze':
+        Cls(xmlFile).analyze()
+    else:
+        raise ValueError(f"未知的调用方式: {kind}")
+
+
+def _peak_rss():
+    """当前进程的峰值常驻内存（字节），无法获取时返回 None"""
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+def worker(moduleFile, cls, kind, xmlFile, tag, resultFile):
+    """
+    子进程中运行单个入口，结果写入 resultFile。每个入口单独一个进程，
+    峰值内存互不影响，变体在导入时执行的代码或崩溃也不会影响其他变体
+    """
+    calls = 0
+
+    def callback(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+
+    result = {}
+    try:
+        # 子进程以 benchmark.py 所在目录为 sys.path[0]：先去掉该目录和已从中导入的模块，
+        # 变体导入同名模块（callDealer、largeXMLDealer 等）时只会找到它自己目录下的文件
+        here = path.dirname(path.abspath(__file__))
+        sys.path[:] = [p for p in sys.path if path.abspath(p or os.curdir) != here]
+        for name, loaded in list(sys.modules.items()):
+            source = getattr(loaded, '__file__', None)
+            if name != '__main__' and source and path.dirname(path.abspath(source)) == here:
+                del sys.modules[name]
+        moduleDir = path.dirname(path.abspath(moduleFile))
+        sys.path.insert(0, moduleDir)
+        os.chdir(moduleDir)
+        spec = importlib.util.spec_from_file_location('benchmark_target', moduleFile)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        start = time.perf_counter()
+        _run_entry(module, cls, kind, xmlFile, tag, callback)
+        result['seconds'] = time.perf_counter() - start
+    except BaseException as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['calls'] = calls
+    result['peak_rss'] = _peak_rss()
+    with open(resultFile, 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+
+
+def run_one(moduleFile, cls, kind, xmlFile, tag, timeout):
+    """在独立子进程中运行一个入口，丢弃其输出，返回 worker 写出的结果"""
+    fd, resultFile = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        subprocess.run([sys.executable, path.abspath(__file__), 'worker',
+                        moduleFile, cls, kind, xmlFile, tag, resultFile],
+                       stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       timeout=timeout)
+        with open(resultFile, encoding='utf-8') as f:
+            text = f.read()
+        return json.loads(text) if text else {'error': '子进程异常退出'}
+    except subprocess.TimeoutExpired:
+        return {'error': f'超时（>{timeout}s）'}
+    finally:
+        os.remove(resultFile)
+
+
+_KIND_NAMES = {'parse3': 'parse', 'parse3_init': 'parse', 'parse2': 'parse',
+               'call_init': '__call__', 'call_func': '__call__', 'decorator': '@decorator', 'analyze': 'analyze'}
+
+
+def benchmark(root, xmlFile, meta, tag='accession', match=None, timeout=3600, baseline=None, tolerance=0.1):
+    """
+    运行所有变体并计算指标
+    :param baseline: 之前保存的结果 {键: 记录}，用于标记吞吐量下降超过 tolerance 的回归
+    :return: 结果记录列表
+    """
+    size_mb = meta['bytes'] / (1 << 20)
+    rows = []
+    for moduleFile, cls, kind in discover(root, match):
+        variant = path.relpath(moduleFile, root)
+        key = f"{variant}:{cls}:{kind}"
+        print(f"运行 {variant} {cls}.{_KIND_NAMES[kind]} ...", flush=True)
+        result = run_one(moduleFile, cls, kind, xmlFile, tag, timeout)
+        row = {'key': key, 'variant': variant, 'class': cls, 'entry': _KIND_NAMES[kind],
+               'calls': result['calls'] if 'calls' in result else None,
+               'peak_rss_mb': result['peak_rss'] / (1 << 20) if result.get('peak_rss') else None,
+               'seconds': result.get('seconds'), 'mb_per_s': None, 'elements_per_s': None,
+               'status': result.get('error', 'ok')}
+        if row['status'] == 'ok' and kind != 'analyze' and not row['calls']:
+            # 正常返回却没有调用回调，多半是变体内部捕获了异常
+            row['status'] = '未调用回调'
+        if row['seconds']:
+            row['mb_per_s'] = size_mb / row['seconds']
+            row['elements_per_s'] = meta['elements'] / row['seconds']
+        old = (baseline or {}).get(key)
+        if old and old.get('mb_per_s') and row['mb_per_s']:
+            change = row['mb_per_s'] / old['mb_per_s'] - 1
+            if change < -tolerance:
+                row['status'] = f"回归 {change:+.0%}"
+        rows.append(row)
+    return rows
+
+
+def print_table(rows, out=sys.stdout):
+    """按吞吐量从高到低打印结果表"""
+    def fmt(value, spec):
+        return format(value, spec) if value is not None else '-'
+
+    ordered = sorted(rows, key=lambda r: -(r['mb_per_s'] or 0))
+    out.write(f"{'MB/s':>9} {'元素/s':>12} {'峰值内存MB':>10} {'耗时s':>9} {'回调次数':>10}  入口        状态  变体\n")
+    for r in ordered:
+        out.write(f"{fmt(r['mb_per_s'], '9.1f')} {fmt(r['elements_per_s'], '12,.0f')} "
+                  f"{fmt(r['peak_rss_mb'], '10.1f')} {fmt(r['seconds'], '9.2f')} {fmt(r['calls'], '10d')}  "
+                  f"{r['entry']:<10}  {r['status']}  {r['variant']}:{r['class']}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="大型 XML 解析器基准测试")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    gen = sub.add_parser('generate', help="只生成测试文件")
+    gen.add_argument('output', help="输出 XML 文件路径")
+    gen.add_argument('--size', default='100M', help="目标大小，如 100M、1G、20G（默认 100M）")
+    gen.add_argument('--seed', type=int, default=0, help="随机种子（默认 0）")
+
+    run = sub.add_parser('run', help="生成（或复用）测试文件并运行所有变体")
+    run.add_argument('--size', default='100M', help="测试文件大小，如 100M、1G、20G（默认 100M）")
+    run.add_argument('--seed', type=int, default=0, help="随机种子（默认 0）")
+    run.add_argument('--workdir', default=tempfile.gettempdir(), help="测试文件存放目录")
+    run.add_argument('--root', default=path.dirname(path.dirname(path.dirname(path.abspath(__file__)))),
+                     help="查找解析器变体的仓库根目录")
+    run.add_argument('--match', default=None, help="只运行路径中包含该字符串的变体")
+    run.add_argument('--tag', default='accession', help="传给解析器的标签（默认 accession）")
+    run.add_argument('--timeout', type=float, default=3600, help="单个变体的超时秒数")
+    run.add_argument('--save', default=None, help="把结果保存为 JSON，作为以后比较的基线")
+    run.add_argument('--baseline', default=None, help="与之前保存的结果比较，标记吞吐量回归")
+    run.add_argument('--tolerance', type=float, default=0.1, help="吞吐量下降超过该比例视为回归（默认 0.1）")
+
+    wrk = sub.add_parser('worker', help=argparse.SUPPRESS)
+    for name in ('module', 'cls', 'kind', 'xml', 'tag', 'result'):
+        wrk.add_argument(name)
+
+    args = parser.parse_args()
+    if args.command == 'worker':
+        worker(args.module, args.cls, args.kind, args.xml, args.tag, args.result)
+        return
+    if args.command == 'generate':
+        meta = generate_uniprot_xml(args.output, parse_size(args.size), args.seed)
+        print(f"已生成 '{args.output}': {meta['bytes'] / (1 << 20):.1f} MB，"
+              f"{meta['entries']} 条记录，{meta['elements']} 个元素")
+        return
+
+    size = parse_size(args.size)
+    xmlFile = path.abspath(path.join(args.workdir, f"uniprot_{args.size}_{args.seed}.xml"))
+    print(f"准备测试文件 '{xmlFile}' ...", flush=True)
+    meta = generate_uniprot_xml(xmlFile, size, args.seed)
+    print(f"测试文件: {meta['bytes'] / (1 << 20):.1f} MB，{meta['entries']} 条记录，{meta['elements']} 个元素")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = {row['key']: row for row in json.load(f)['results']}
+    rows = benchmark(args.root, xmlFile, meta, args.tag, args.match, args.timeout, baseline, args.tolerance)
+    print()
+    print_table(rows)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'file': meta, 'tag': args.tag, 'results': rows}, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已保存到 '{args.save}'")
+
+
+if __name__ == "__main__":
+    main()
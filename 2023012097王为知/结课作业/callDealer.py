@@ -1,10 +1,131 @@
 from functools import wraps
 from lxml import etree
 from largeXMLDealer import largeXMLDealer
+import csv
 import os
+import queue
 import sys
+import threading
 import time
 
+# Parquet 输出依赖 pyarrow，未安装时只能使用文本/CSV 输出
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# 输出记录的列：元素标签名和元素文本
+OUTPUT_FIELDS = ('tag', 'text')
+
+
+class TextSink:
+    """文本输出：每条记录写一行，只写最后一列（元素文本）"""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write_batch(self, rows):
+        self._stream.write(''.join(row[-1] + "\n" for row in rows))
+
+    def close(self):
+        self._stream.flush()
+
+
+class CsvSink:
+    """CSV 输出：首行为列名，之后每条记录一行"""
+
+    def __init__(self, stream, fields=OUTPUT_FIELDS):
+        self._stream = stream
+        self._writer = csv.writer(stream)
+        self._writer.writerow(fields)
+
+    def write_batch(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._stream.flush()
+
+
+class ParquetSink:
+    """Parquet 列式输出：每批记录按列转置后写为一个行组（row group）"""
+
+    def __init__(self, stream, fields=OUTPUT_FIELDS):
+        if pyarrow is None:
+            raise ImportError("Parquet 输出需要安装 pyarrow: pip install pyarrow")
+        self._fields = fields
+        self._schema = pyarrow.schema([(field, pyarrow.string()) for field in fields])
+        self._writer = pyarrow.parquet.ParquetWriter(stream, self._schema)
+
+    def write_batch(self, rows):
+        columns = list(zip(*rows))
+        table = pyarrow.Table.from_arrays([pyarrow.array(column, pyarrow.string()) for column in columns],
+                                          schema=self._schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+
+
+# 输出格式 -> 输出类；按输出文件扩展名选择，其余扩展名均按文本输出
+SINKS = {'text': TextSink, 'csv': CsvSink, 'parquet': ParquetSink}
+
+
+class AsyncWriter:
+    """
+    异步输出：解析线程只把记录攒成批次放入有界队列，由后台线程写入输出，
+    解析不会因为控制台或磁盘 I/O 而停顿；队列满时解析线程等待，内存占用有上限
+    """
+
+    def __init__(self, sink, flush_size=1000, queue_size=8):
+        """
+        :param sink: 输出对象（TextSink / CsvSink / ParquetSink）
+        :param flush_size: 每批记录数，攒满后交给后台线程写出
+        :param queue_size: 队列中最多等待写出的批次数
+        """
+        self._sink = sink
+        self._flush_size = flush_size
+        self._batch = []
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def _drain(self):
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                break
+            if self._error is None:
+                try:
+                    self._sink.write_batch(batch)
+                except Exception as e:
+                    # 出错后继续取走队列中的批次，避免解析线程阻塞在 put 上
+                    self._error = e
+
+    def write(self, *row):
+        """写入一条记录，各参数依次为各列的值"""
+        if self._error is not None:
+            raise self._error
+        self._batch.append(row)
+        if len(self._batch) >= self._flush_size:
+            self.flush()
+
+    def flush(self):
+        """把当前批次交给后台线程"""
+        if self._batch:
+            self._queue.put(self._batch)
+            self._batch = []
+
+    def close(self):
+        """写出剩余记录并等待后台线程结束"""
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._sink.close()
+        if self._error is not None:
+            raise self._error
+
 def xml_parser():
     """
     XML解析装饰器工厂
@@ -17,6 +138,8 @@ def xml_parser():
             file_name = kwargs.get('file_name')
             element_tag = kwargs.get('element_tag')
             output_file = kwargs.get('output_file', None)
+            output_format = kwargs.get('output_format', 'text')
+            flush_size = kwargs.get('flush_size', 1000)
             
             # 验证文件存在性
             if not os.path.isfile(file_name):
@@ -26,33 +149,39 @@ def xml_parser():
             # 创建XML处理器
             dealer = largeXMLDealer()
             
+            # 目标标签可以是单个标签、逗号分隔的多个标签或标签列表；
+            # 解析前一次性转换为 {*}tag（匹配任意命名空间），交给 libxml2 过滤，Python 回调只会收到匹配的元素
+            if isinstance(element_tag, str):
+                element_tag = [tag.strip() for tag in element_tag.split(',') if tag.strip()]
+            tags = dealer.resolveTags(element_tag) if element_tag else None
+            
+            # 结果经后台线程异步写出；未指定输出文件时写到控制台
+            writer = AsyncWriter(SINKS[output_format](output_file or sys.stdout), flush_size)
+            
             # 计数器初始化
             element_count = 0
             
             # 定义元素处理回调
             def element_processor(elem):
                 nonlocal element_count
-                # 提取标签名（忽略命名空间）
-                raw_tag = elem.tag
-                tag_name = raw_tag.split('}', 1)[-1] if '}' in raw_tag else raw_tag
-                
-                # 检查标签匹配
-                if element_tag is None or tag_name == element_tag:
-                    element_count += 1
-                    try:
-                        # 调用被装饰的函数处理元素
-                        func_to_decorate(elem, output_file=output_file)
-                    except Exception as e:
-                        print(f"警告: 处理元素 <{tag_name}> 时出错 - {str(e)}")
+                element_count += 1
+                try:
+                    # 调用被装饰的函数处理元素
+                    func_to_decorate(elem, output_file=writer)
+                except Exception as e:
+                    print(f"警告: 处理元素 <{etree.QName(elem).localname}> 时出错 - {str(e)}")
             
             # 开始解析XML
             start_time = time.time()
             file_size = os.path.getsize(file_name)
             size_mb = file_size / (1024 * 1024)
             print(f"开始解析XML文件: '{file_name}'")
-            print(f"目标标签: '{element_tag if element_tag else '所有标签'}'")
+            print(f"目标标签: '{', '.join(element_tag) if element_tag else '所有标签'}'")
             
-            dealer.parse(file_name, element_processor)
+            try:
+                dealer.parse(file_name, element_processor, tags=tags)
+            finally:
+                writer.close()
             
             # 计算处理时间
             elapsed = time.time() - start_time
@@ -68,17 +197,14 @@ def process_element(elem, output_file=None):
     """
     简洁的元素处理函数
     :param elem: XML元素对象
-    :param output_file: 输出文件对象
+    :param output_file: 异步输出对象（AsyncWriter）
     """
     # 提取元素文本内容 - 仅当有文本时处理
     if elem.text and elem.text.strip():
         text = elem.text.strip()
         
         # 输出结果
-        if output_file:
-            output_file.write(text + "\n")
-        else:
-            print(text)
+        output_file.write(etree.QName(elem).localname, text)
 
 def print_usage():
     """打印使用说明"""
@@ -87,10 +213,12 @@ def print_usage():
     print("示例:")
     print("  python callDealer.py proteins.xml accession")
     print("  python callDealer.py taxonomy.xml taxon results.txt")
+    print("  python callDealer.py proteins.xml accession,name")
+    print("  python callDealer.py proteins.xml accession,name results.csv")
     print("说明:")
     print("  - XML文件: 要解析的XML文件路径")
-    print("  - 目标标签: 要处理的XML元素标签")
-    print("  - 输出文件: (可选) 结果输出文件路径")
+    print("  - 目标标签: 要处理的XML元素标签，多个标签用逗号分隔")
+    print("  - 输出文件: (可选) 结果输出文件路径，扩展名为 .csv / .parquet 时输出对应格式")
 
 if __name__ == "__main__":
     # 检查命令行参数
@@ -111,9 +239,22 @@ if __name__ == "__main__":
         if output_path:
             # 文件输出模式
             output_path = os.path.abspath(output_path)
-            with open(output_path, 'w', encoding='utf-8') as f:
+            output_format = os.path.splitext(output_path)[1].lower().lstrip('.')
+            if output_format not in SINKS:
+                output_format = 'text'
+            if output_format == 'parquet':
+                if pyarrow is None:
+                    print("错误: Parquet 输出需要安装 pyarrow: pip install pyarrow")
+                    sys.exit(1)
+                f = open(output_path, 'wb')
+            elif output_format == 'csv':
+                f = open(output_path, 'w', encoding='utf-8', newline='')
+            else:
+                f = open(output_path, 'w', encoding='utf-8')
+            with f:
                 print(f"结果将输出到: '{output_path}'")
-                process_element(file_name=xml_file, element_tag=elem_tag, output_file=f)
+                process_element(file_name=xml_file, element_tag=elem_tag, output_file=f,
+                                output_format=output_format)
         else:
             # 控制台输出模式
             process_element(file_name=xml_file, element_tag=elem_tag)
@@ -6,51 +6,539 @@
 
 from lxml import etree
 from os import path
+from concurrent.futures import ProcessPoolExecutor
+import bz2
+import gzip
+import json
+import lzma
+import mmap
+import os
+import pickle
+import queue
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+# 列式抽取依赖 NumPy，未安装时其余功能不受影响
+try:
+    import numpy as np
+except ImportError:
+    np = None
+# 没有 /proc 时用 resource 读取进程内存（Windows 上没有该模块）
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# 查找记录边界时每次读取的字节数
+_SCAN_BLOCK = 1 << 20
+# 文件头中的标记：注释、XML 声明/DOCTYPE、开始标签（分组 1 为标签名）
+_MARKUP = re.compile(rb'<!--.*?-->|<[?!][^>]*>|<([^\s?!/>]+)[^>]*>', re.S)
+# 跨块查找标签时保留的末尾字节数（需长于最长的 <前缀:记录标签 加一个结束字符）
+_TAG_OVERLAP = 256
+# 偏移索引文件的扩展名及首行标记
+_INDEX_SUFFIX = '.idx'
+_INDEX_MAGIC = '#largeXMLDealer-index'
+# 根元素命名空间缓存: (文件路径, 修改时间, 文件大小) -> 命名空间
+_namespace_cache = {}
+# 压缩格式: 扩展名 -> (Python 解压函数, 按优先级排列的外部解压命令；pigz/lbzip2/xz -T0 为多线程，
+# 外部命令在独立进程中运行，与解析并行)
+_DECOMPRESSORS = {
+    '.gz': (gzip.open, [['pigz', '-dc'], ['gzip', '-dc']]),
+    '.bz2': (bz2.open, [['lbzip2', '-dc'], ['pbzip2', '-dc']]),
+    '.xz': (lzma.open, [['xz', '-dc', '-T0']]),
+}
+# 预读线程的缓冲块数（每块 _SCAN_BLOCK 字节）
+_PREFETCH_BLOCKS = 8
+# 断点文件的扩展名及格式标记
+_CHECKPOINT_SUFFIX = '.ckpt'
+_CHECKPOINT_MAGIC = 'largeXMLDealer-checkpoint-1'
+# 列式输出目录中的列描述文件
+_COLUMN_SCHEMA = '_schema.json'
+# UniProt 记录常用字段: 列名 -> (相对 entry 的路径, 类型)；路径末尾的 @attr 表示取属性
+UNIPROT_FIELDS = {
+    'accession': ('accession', 'str'),
+    'name': ('name', 'str'),
+    'organism': ("organism/name[@type='scientific']", 'str'),
+    'length': ('sequence/@length', 'int64'),
+    'mass': ('sequence/@mass', 'float64'),
+}
+
+
+class _ShardReader:
+    """
+    分片读取器：依次返回 文件头 + 文件中 [start, end) 字节 + 根结束标签，
+    使每个分片都是一个完整的 XML 文档，且无需把整个分片读入内存
+    """
+
+    def __init__(self, fileName, start, end, header, footer):
+        self._file = open(fileName, 'rb')
+        self._file.seek(start)
+        self._remaining = end - start
+        self._header = header
+        self._footer = footer
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = _SCAN_BLOCK
+        if self._header:
+            chunk, self._header = self._header[:size], self._header[size:]
+            return chunk
+        if self._remaining > 0:
+            chunk = self._file.read(min(size, self._remaining))
+            self._remaining -= len(chunk)
+            if chunk:
+                return chunk
+            self._remaining = 0
+        chunk, self._footer = self._footer[:size], self._footer[size:]
+        return chunk
+
+    def close(self):
+        self._file.close()
+
+
+class _PrefetchReader:
+    """
+    预读读取器：后台线程从解压流中读取数据块放入有界队列，
+    zlib/bz2/lzma 解压时会释放 GIL，因此解压与 XML 解析可以并行进行
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._queue = queue.Queue(maxsize=_PREFETCH_BLOCKS)
+        self._buffer = b''
+        self._eof = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._fill, daemon=True)
+        self._thread.start()
+
+    def _fill(self):
+        try:
+            while not self._closed:
+                chunk = self._stream.read(_SCAN_BLOCK)
+                self._queue.put(chunk)
+                if not chunk:
+                    break
+        except Exception as e:
+            self._queue.put(e)
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = _SCAN_BLOCK
+        while not self._buffer and not self._eof:
+            chunk = self._queue.get()
+            if isinstance(chunk, Exception):
+                raise chunk
+            if not chunk:
+                self._eof = True
+            self._buffer = chunk
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+    def close(self):
+        self._closed = True
+        # 取走队列中的数据，让阻塞在 put 上的后台线程得以退出
+        while self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        self._stream.close()
+
+
+class _ProcessReader:
+    """
+    外部解压进程（如 pigz）的标准输出读取器，关闭时结束进程。
+    读到输出结尾或关闭时检查退出码，压缩文件损坏或被截断时抛出 OSError，
+    与 Python 解压模块的行为一致，不会把不完整的输出当作完整文件
+    """
+
+    def __init__(self, command):
+        self._command = command
+        self._process = subprocess.Popen(command, stdout=subprocess.PIPE)
+        self._checked = False
+        self._eof = False
+
+    def _check(self):
+        """等待进程结束，退出码非 0 时抛出 OSError（每个进程只报告一次）"""
+        code = self._process.wait()
+        if code != 0 and not self._checked:
+            self._checked = True
+            raise OSError(f"解压命令 '{' '.join(self._command)}' 异常退出，退出码 {code}")
+        self._checked = True
+
+    def read(self, size=-1):
+        data = self._process.stdout.read(size)
+        if not data or size is None or size < 0:
+            self._eof = True
+            self._check()
+        return data
+
+    def close(self):
+        self._process.stdout.close()
+        if not self._eof:
+            # 提前关闭（未读完输出）时由我们结束进程；进程可能已因管道关闭（SIGPIPE）退出，
+            # 此时的退出码不代表文件损坏
+            if self._process.poll() is None:
+                self._process.terminate()
+            self._process.wait()
+            return
+        self._check()
+
+
+def _is_compressed(fileName):
+    """是否为支持的压缩文件（.gz / .bz2 / .xz）"""
+    return path.splitext(fileName)[1].lower() in _DECOMPRESSORS
+
+
+def _open_xml(fileName):
+    """
+    打开 XML 输入：普通文件直接返回路径交给 libxml2 读取；
+    压缩文件优先使用外部解压工具，没有时用 Python 解压并由后台线程预读
+    :return: 文件路径或带 read/close 方法的读取器
+    """
+    ext = path.splitext(fileName)[1].lower()
+    if ext not in _DECOMPRESSORS:
+        return fileName
+    opener, commands = _DECOMPRESSORS[ext]
+    for command in commands:
+        if shutil.which(command[0]):
+            return _ProcessReader(command + [fileName])
+    return _PrefetchReader(opener(fileName, 'rb'))
+
+
+def _close_xml(source):
+    """关闭 _open_xml 返回的读取器"""
+    if not isinstance(source, str):
+        source.close()
+
+
+def _open_stream(fileName):
+    """打开可按块读取的输入流：普通文件以二进制方式打开，压缩文件同 _open_xml"""
+    source = _open_xml(fileName)
+    return open(source, 'rb') if isinstance(source, str) else source
+
+
+def _skip_stream(stream, count):
+    """在输入流中向后跳过 count 字节：普通文件直接 seek，压缩流只能读取后丢弃"""
+    if hasattr(stream, 'seek'):
+        stream.seek(count, os.SEEK_CUR)
+        return
+    while count > 0:
+        chunk = stream.read(min(count, _SCAN_BLOCK))
+        if not chunk:
+            break
+        count -= len(chunk)
+
+
+def _record_pattern(record_tag, closing=False):
+    """
+    记录开始标签 <record_tag（closing 为 True 时为结束标签 </record_tag>）的字节正则，
+    允许带命名空间前缀（如 <u:entry）
+    """
+    prefix = rb'</(?:[^\s<>/!?:]+:)?' if closing else rb'<(?:[^\s<>/!?:]+:)?'
+    return re.compile(prefix + re.escape(record_tag) + (rb'\s*>' if closing else rb'[\s>/]'))
+
+
+def _find_record_start(f, offset, limit, record_tag):
+    """
+    从 offset 开始向后查找第一个记录开始标签 <record_tag（或带命名空间前缀的 <prefix:record_tag）的字节位置
+    :return: 找到的位置，找不到时返回 limit
+    """
+    pattern = _record_pattern(record_tag)
+    f.seek(offset)
+    pos = offset
+    tail = b''
+    while pos < limit:
+        block = f.read(_SCAN_BLOCK)
+        if not block:
+            break
+        data = tail + block
+        base = pos - len(tail)
+        match = pattern.search(data)
+        if match:
+            return min(base + match.start(), limit)
+        # 保留末尾若干字节，避免标签跨块时被漏掉
+        tail = data[-_TAG_OVERLAP:]
+        pos += len(block)
+    return limit
+
+
+def _find_root_end(f, size):
+    """从文件末尾向前查找根元素结束标签 </...> 的位置"""
+    back = min(size, _SCAN_BLOCK)
+    f.seek(size - back)
+    data = f.read(back)
+    idx = data.rfind(b'</')
+    return size - back + idx if idx != -1 else size
+
+
+def _root_start(header):
+    """
+    找出文件头中的根元素开始标签（跳过 XML 声明、注释和 DOCTYPE）
+    :return: (根标签名, 开始标签结束处的字节位置)，找不到时返回 (None, len(header))
+    """
+    for match in _MARKUP.finditer(header):
+        if match.group(1):
+            return match.group(1), match.end()
+    return None, len(header)
+
+
+def _root_footer(header):
+    """根据文件头中的根元素（第一个开始标签）构造对应的结束标签"""
+    name, _ = _root_start(header)
+    return b'</' + name + b'>' if name else b''
+
+
+def _current_rss():
+    """当前进程的常驻内存（字节）；没有 /proc 时退而返回峰值常驻内存，都取不到时返回 None"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 上单位为 KB，macOS 上为字节
+    return maxrss if os.uname().sysname == 'Darwin' else maxrss * 1024
+
+
+class StreamStats:
+    """
+    流式解析的实时指标。每收到 sample_every 个元素（包括只为清理内存而订阅的记录元素）
+    统计一次树中仍保留的元素数和进程内存，各属性可在其他线程中随时读取
+    （如定时上报监控，在保留元素数持续增长时告警）。
+    保留元素数在清理当前元素之前从文档根开始统计，包括解析器已从当前输入块中解析、
+    但尚未交给处理函数的元素，正常情况下稳定在几百到几千之间，不随文件大小增长
+    """
+
+    def __init__(self, sample_every=10000):
+        self.sample_every = sample_every
+        self.reset()
+
+    def reset(self):
+        """开始新的解析前清零"""
+        self.elements = 0
+        self.retained = 0
+        self.peak_retained = 0
+        self.rss = None
+        self.peak_rss = None
+
+    def tick(self, elem):
+        """处理完一个元素、清理它之前调用，按间隔采样"""
+        self.elements += 1
+        if self.elements % self.sample_every == 0:
+            self.sample(elem)
+
+    def sample(self, elem):
+        """统计 elem 所在树中保留的元素数及当前进程内存"""
+        self.retained = sum(1 for _ in elem.getroottree().getroot().iter())
+        self.peak_retained = max(self.peak_retained, self.retained)
+        self.rss = _current_rss()
+        if self.rss is not None:
+            self.peak_rss = max(self.peak_rss or 0, self.rss)
+
+    def as_dict(self):
+        return {
+            'elements': self.elements,
+            'retained': self.retained,
+            'peak_retained': self.peak_retained,
+            'rss': self.rss,
+            'peak_rss': self.peak_rss,
+        }
+
+
+def _tag_matcher(tags):
+    """
+    返回判断完整标签名是否属于 tags 的函数，规则与 iterparse 的 tag 参数一致：
+    {*}tag 匹配任意命名空间（含无命名空间）下的 tag，其余按完整标签名精确匹配
+    """
+    exact = frozenset(tag for tag in tags if not tag.startswith('{*}'))
+    local = frozenset(tag[3:] for tag in tags if tag.startswith('{*}'))
+    if not local:
+        return exact.__contains__
+    return lambda tag: tag in exact or tag.rpartition('}')[2] in local
+
+
+class _StreamCore:
+    """
+    所有流式解析共用的元素处理与内存清理逻辑。
+    每个收到的元素处理完后清空它，并删除它及各级祖先之前已处理完的兄弟节点。
+    只有收到结束事件的元素才会被清理：按 tag 过滤事件时，其余元素要等到之后某个收到的元素
+    清理前序兄弟时才一并删除，因此调用方需同时订阅记录标签（如 entry）的结束事件，
+    只是不把记录交给处理函数，这样保留的元素数为 O(深度) 加上一条记录的大小。
+    指定 tags 时，嵌套在另一个目标元素中的元素（如 entry 中的 accession）暂不清理，
+    由外层目标元素处理完后一并清理，保证外层元素交给处理函数时内容完整。
+    不会清空尚未结束的祖先元素，祖先的属性和文本在其结束事件中仍然完整。
+    """
+
+    def __init__(self, tags=None, stats=None):
+        """
+        :param tags: 传给处理函数的完整标签名列表，None 表示所有元素
+        :param stats: 实时指标（StreamStats），None 表示不统计
+        """
+        self._wanted = _tag_matcher(tags) if tags else None
+        self._stats = stats
+
+    def release(self, elem):
+        """清理已处理的元素及其之前的兄弟节点"""
+        if self._wanted is not None:
+            for ancestor in elem.iterancestors():
+                if self._wanted(ancestor.tag):
+                    return
+        elem.clear()
+        node, parent = elem, elem.getparent()
+        while parent is not None:
+            while node.getprevious() is not None:
+                del parent[0]
+            node, parent = parent, parent.getparent()
+
+    def run(self, events, func_for_element):
+        """对 (事件, 元素) 序列中的每个元素调用处理函数，随后清理该元素"""
+        elem = None
+        for event, elem in events:
+            try:
+                func_for_element(elem)
+            except Exception as e:
+                print(f"警告: 处理元素 <{elem.tag}> 时出错 - {str(e)}")
+            finally:
+                if self._stats is not None:
+                    self._stats.tick(elem)
+                self.release(elem)
+        if self._stats is not None and elem is not None:
+            self._stats.sample(elem)
+
+
+def _parse_shard(fileName, start, end, header, footer, record_tag, func_for_element, tags=None):
+    """
+    在子进程中解析单个分片（必须是模块级函数，才能被进程池序列化）
+    :return: (处理的记录数, 回调函数返回的非 None 结果列表)
+    """
+    reader = _ShardReader(fileName, start, end, header, footer)
+    count = 0
+    results = []
+    record = record_tag.decode()
+    # 记录标签始终参与事件过滤，用于计数；只有 tags 中的标签才交给处理函数
+    wanted = _tag_matcher(tags) if tags else None
+
+    def collect(elem):
+        nonlocal count
+        if etree.QName(elem).localname == record:
+            count += 1
+        if wanted is None or wanted(elem.tag):
+            result = func_for_element(elem)
+            if result is not None:
+                results.append(result)
+
+    try:
+        events = etree.iterparse(reader, events=('end',), recover=True,
+                                 tag=list(tags) + ['{*}' + record] if tags else None)
+        _StreamCore(tags).run(events, collect)
+    finally:
+        reader.close()
+    return count, results
+
 
 class largeXMLDealer:
     """大型XML文件处理类"""
-    
-    def __init__(self):
-        """构造函数"""
-        pass
 
-    def parse(self, fileName, func_for_element):
+    def __init__(self, stats_every=10000):
+        """
+        构造函数
+        :param stats_every: 每处理多少个元素采样一次实时指标（见 self.stats）
+        """
+        # 已加载的偏移索引缓存: 索引文件路径 -> (文件头字节, {键: (偏移, 长度)})
+        self._indexes = {}
+        # 单遍分发的处理函数注册表: 标签名 -> [处理函数, ...]
+        self._handlers = {}
+        # 当前（或最近一次）单进程解析的实时指标：保留元素数、进程内存等
+        self.stats = StreamStats(stats_every)
+
+    def getNamespace(self, fileName):
+        """
+        读取根元素声明的默认命名空间。只解析到根元素的开始标签为止，结果按文件缓存
+        :param fileName: XML文件路径
+        :return: 命名空间，没有时返回空字符串
+        """
+        st = os.stat(fileName)
+        key = (path.abspath(fileName), st.st_mtime_ns, st.st_size)
+        if key not in _namespace_cache:
+            namespace = ''
+            source = _open_xml(fileName)
+            try:
+                for event, item in etree.iterparse(source, events=('start-ns', 'start')):
+                    if event == 'start':
+                        break
+                    prefix, uri = item
+                    if not prefix:
+                        namespace = uri
+            finally:
+                _close_xml(source)
+            _namespace_cache[key] = namespace
+        return _namespace_cache[key]
+
+    def resolveTags(self, tags):
+        """
+        把不带命名空间的标签名转换为 iterparse 使用的 {*}tag，匹配任意命名空间（含带前缀的
+        命名空间和无命名空间）下的同名元素，因此不需要读取文件的命名空间
+        :param tags: 标签名或标签名列表；已带 {...} 的标签保持不变
+        :return: 完整标签名列表
+        """
+        if isinstance(tags, str):
+            tags = [tags]
+        return [tag if tag.startswith('{') else '{*}' + tag for tag in tags]
+
+    def parse(self, fileName, func_for_element, processes=1, record_tag='entry', merge=None, tags=None):
         """
         迭代解析XML文件，并在遇到每个元素的结束标签时调用处理函数
         :param fileName: XML文件路径
         :param func_for_element: 元素处理回调函数
+        :param processes: 并行进程数，大于 1 时按记录边界分片并行解析
+        :param record_tag: 记录标签（如 UniProt 的 entry）：分片模式下按它切分文件；
+                           指定 tags 时总是同时订阅它的结束事件，用于逐条清理记录（不交给处理函数）
+        :param merge: 分片模式下合并各分片结果的函数，参数为各分片结果列表
+        :param tags: 完整标签名列表（见 resolveTags），指定后由 libxml2 过滤，
+                     只有这些标签的元素才会传给处理函数
+        :return: 分片模式下返回合并后的结果，串行模式返回 None
+
+        .gz / .bz2 / .xz 压缩文件会边解压边解析，无需先解压到磁盘
         """
         # 验证文件存在性
         if not path.isfile(fileName):
             print(f"错误: 文件 '{fileName}' 不存在")
             return
 
+        if processes and processes > 1:
+            if not _is_compressed(fileName):
+                return self.parse_sharded(fileName, func_for_element, processes, record_tag, merge, tags)
+            print("警告: 压缩文件无法按字节分片，改为单进程流式解析")
+
+        self.stats.reset()
+        func_for_element = func_for_element or (lambda elem: None)
+        if tags:
+            # 只订阅 tags 时，罕见标签（如 copyright）之间的记录永远收不到事件、也就不会被清理，
+            # 整棵树都会留在内存中；因此同时订阅记录标签，记录只用于清理，不交给处理函数
+            wanted = _tag_matcher(tags)
+            events = list(tags) + self.resolveTags(record_tag) if record_tag else tags
+            handle = lambda elem: func_for_element(elem) if wanted(elem.tag) else None
+        else:
+            events, handle = None, func_for_element
+        source = _open_xml(fileName)
         try:
             # 创建迭代解析上下文
-            context = etree.iterparse(fileName, events=('end',), recover=True)
-            
-            # 遍历XML元素
-            for event, elem in context:
-                if func_for_element and elem is not None:
-                    try:
-                        # 调用元素处理函数
-                        func_for_element(elem)
-                    except Exception as e:
-                        # 异常处理
-                        tag = elem.tag if hasattr(elem, 'tag') else '未知标签'
-                        print(f"警告: 处理元素 <{tag}> 时出错 - {str(e)}")
-                    finally:
-                        # 清理元素释放内存
-                        elem.clear()
-                        parent = elem.getparent()
-                        if parent is not None:
-                            parent.clear()
-            
+            context = etree.iterparse(source, events=('end',), recover=True, tag=events)
+
+            # 遍历XML元素，逐个调用处理函数并清理
+            _StreamCore(tags, self.stats).run(context, handle)
+
             # 清理根元素
             root = context.root
             if root is not None:
                 root.clear()
-                
+
         except etree.XMLSyntaxError as e:
             print(f"XML语法错误: {str(e)}")
         except Exception as e:
@@ -59,3 +547,516 @@ class largeXMLDealer:
             # 确保上下文被清理
             if 'context' in locals():
                 del context
+            _close_xml(source)
+
+    def register(self, tag, handler):
+        """
+        注册标签处理函数，同一标签可注册多个处理函数
+        :param tag: 标签名（不带命名空间时解析前自动补全）
+        :param handler: 处理函数，参数为元素
+        """
+        self._handlers.setdefault(tag, []).append(handler)
+
+    def handler(self, *tags):
+        """
+        注册处理函数的装饰器形式，例如 @dealer.handler('accession', 'name')
+        :param tags: 一个或多个标签名
+        """
+        def decorator(func):
+            for tag in tags:
+                self.register(tag, func)
+            return func
+        return decorator
+
+    def dispatch(self, fileName):
+        """
+        单遍解析文件，把每个已注册标签的元素分发给对应的所有处理函数，
+        多个标签的处理只需读取一次文件
+        :param fileName: XML文件路径
+        :return: 各标签（注册时的名字）处理的元素数量
+        """
+        counts = {tag: 0 for tag in self._handlers}
+        if not path.isfile(fileName):
+            print(f"错误: 文件 '{fileName}' 不存在")
+            return counts
+        if not self._handlers:
+            return counts
+
+        # 完整标签名 -> [(注册时的名字, 处理函数列表), ...]；
+        # 不同的名字可能对应同一个完整标签名（如 entry 与 {*}entry），处理函数都要保留
+        routes = {}
+        for tag, handlers in self._handlers.items():
+            routes.setdefault(self.resolveTags(tag)[0], []).append((tag, handlers))
+
+        def route(elem):
+            # 一个元素可能同时匹配精确标签名 {ns}tag 和通配标签名 {*}tag 下注册的处理函数
+            matched = routes.get(elem.tag, [])
+            wildcard = '{*}' + etree.QName(elem).localname
+            if wildcard != elem.tag:
+                matched = matched + routes.get(wildcard, [])
+            for tag, handlers in matched:
+                counts[tag] += 1
+                for handler in handlers:
+                    try:
+                        handler(elem)
+                    except Exception as e:
+                        print(f"警告: 处理元素 <{tag}> 时出错 - {str(e)}")
+
+        self.parse(fileName, route, tags=list(routes))
+        return counts
+
+    @staticmethod
+    def _save_checkpoint(checkpointFile, fileName, offset, records, elements, state):
+        """原子地写入断点文件：先写临时文件再替换，中途被终止也不会留下损坏的断点"""
+        st = os.stat(fileName)
+        checkpoint = {
+            'magic': _CHECKPOINT_MAGIC,
+            'file': path.abspath(fileName),
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'offset': offset,
+            'records': records,
+            'elements': elements,
+            'state': state,
+        }
+        tmpFile = checkpointFile + '.tmp'
+        with open(tmpFile, 'wb') as f:
+            pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmpFile, checkpointFile)
+
+    @staticmethod
+    def _load_checkpoint(checkpointFile, fileName):
+        """读取断点文件；不存在、格式不符或源文件已变化时返回 None"""
+        if not path.isfile(checkpointFile):
+            return None
+        with open(checkpointFile, 'rb') as f:
+            checkpoint = pickle.load(f)
+        st = os.stat(fileName)
+        if (checkpoint.get('magic') != _CHECKPOINT_MAGIC
+                or checkpoint['size'] != st.st_size or checkpoint['mtime_ns'] != st.st_mtime_ns):
+            print(f"警告: 断点文件 '{checkpointFile}' 与 '{fileName}' 不匹配，从头开始解析")
+            return None
+        return checkpoint
+
+    def parse_resumable(self, fileName, func_for_element, checkpointFile=None, record_tag='entry',
+                        interval=60.0, resume=True, tags=None, get_state=None, set_state=None):
+        """
+        可断点续传的流式解析：每隔 interval 秒在最近一个完整记录的结束位置写入断点
+        （字节偏移、记录数、元素数及处理函数的状态），中断后以 resume=True 重新调用时
+        跳过已处理的部分，从断点处的记录边界继续解析。
+        （假设记录标签之间不互相嵌套，UniProt 的 entry 满足这一点）
+        :param fileName: XML文件路径，支持 .gz / .bz2 / .xz（续传时需重新解压跳过已处理部分）
+        :param func_for_element: 元素处理回调函数
+        :param checkpointFile: 断点文件路径，默认为 <fileName>.ckpt
+        :param record_tag: 记录标签，断点只设在该标签的结束位置
+        :param interval: 写断点的最小时间间隔（秒）
+        :param resume: 是否从已有断点继续
+        :param tags: 完整标签名列表（见 resolveTags），只处理这些标签的元素
+        :param get_state: 返回处理函数当前状态的函数，状态随断点保存（需可 pickle）
+        :param set_state: 续传时用断点中保存的状态恢复处理函数
+        :return: (记录数, 元素数)；全部解析完成后删除断点文件
+        """
+        if not path.isfile(fileName):
+            print(f"错误: 文件 '{fileName}' 不存在")
+            return 0, 0
+        checkpointFile = checkpointFile or fileName + _CHECKPOINT_SUFFIX
+
+        offset = records = elements = 0
+        checkpoint = self._load_checkpoint(checkpointFile, fileName) if resume else None
+        if checkpoint is not None:
+            offset, records, elements = checkpoint['offset'], checkpoint['records'], checkpoint['elements']
+            if set_state:
+                set_state(checkpoint['state'])
+            print(f"从断点继续: 偏移 {offset}，已处理 {records} 条 <{record_tag}> 记录")
+
+        # 记录标签始终参与事件过滤，用于计数；只有 tags 中的标签才交给处理函数
+        record = self.resolveTags(record_tag)[0]
+        wanted = _tag_matcher(tags) if tags else None
+        core = _StreamCore(tags, self.stats)
+        self.stats.reset()
+        start_pattern = _record_pattern(record_tag.encode())
+        end_pattern = _record_pattern(record_tag.encode(), closing=True)
+        parser = etree.XMLPullParser(events=('end',), recover=True,
+                                     tag=list(tags) + [record] if tags else None)
+
+        def handle(elem):
+            nonlocal records, elements
+            if etree.QName(elem).localname == record_tag:
+                records += 1
+            if wanted is None or wanted(elem.tag):
+                elements += 1
+                func_for_element(elem)
+
+        def drain():
+            core.run(parser.read_events(), handle)
+
+        stream = _open_stream(fileName)
+        try:
+            # 读到第一个记录开始标签为止，得到文件头（XML 声明和根元素开始标签）
+            data = b''
+            while True:
+                block = stream.read(_SCAN_BLOCK)
+                data += block
+                match = start_pattern.search(data)
+                if match or not block:
+                    break
+            if checkpoint is None:
+                parser.feed(data)
+            else:
+                # 续传：只送入文件头以建立根元素和命名空间，然后跳到断点处的记录边界
+                parser.feed(data[:match.start()] if match else data)
+                if offset < len(data):
+                    parser.feed(data[offset:])
+                else:
+                    _skip_stream(stream, offset - len(data))
+            pos = max(offset, len(data))
+            drain()
+
+            last = time.monotonic()
+            while True:
+                block = stream.read(_SCAN_BLOCK)
+                if not block:
+                    break
+                cut = -1
+                if time.monotonic() - last >= interval:
+                    for match in end_pattern.finditer(block):
+                        cut = match.end()
+                if cut != -1:
+                    # 在本块最后一个记录结束处切开：之前的记录都已处理完，可以安全地写断点
+                    parser.feed(block[:cut])
+                    drain()
+                    self._save_checkpoint(checkpointFile, fileName, pos + cut, records, elements,
+                                          get_state() if get_state else None)
+                    last = time.monotonic()
+                    parser.feed(block[cut:])
+                else:
+                    parser.feed(block)
+                drain()
+                pos += len(block)
+            parser.close()
+            drain()
+        except etree.XMLSyntaxError as e:
+            print(f"XML语法错误: {str(e)}")
+            return records, elements
+        finally:
+            _close_xml(stream)
+
+        if path.isfile(checkpointFile):
+            os.remove(checkpointFile)
+        return records, elements
+
+    def split_shards(self, fileName, shards, record_tag='entry'):
+        """
+        按记录开始标签把文件切分为若干字节区间
+        :param fileName: XML文件路径
+        :param shards: 期望的分片数
+        :param record_tag: 记录标签
+        :return: (文件头字节, [(start, end), ...])
+        """
+        tag = record_tag.encode()
+        size = os.path.getsize(fileName)
+        with open(fileName, 'rb') as f:
+            first = _find_record_start(f, 0, size, tag)
+            if first >= size:
+                return b'', []
+            # 文件头只取到根元素开始标签为止：第一个记录之前的其他元素（如 copyright）
+            # 归入第一个分片，而不是作为文件头重复出现在每个分片中
+            f.seek(0)
+            _, root_end = _root_start(f.read(first))
+            f.seek(0)
+            header = f.read(root_end)
+            last = _find_root_end(f, size)
+
+            bounds = [root_end]
+            step = max((last - first) // shards, 1)
+            for i in range(1, shards):
+                offset = _find_record_start(f, first + i * step, last, tag)
+                if offset > bounds[-1]:
+                    bounds.append(offset)
+            bounds.append(last)
+        return header, [(s, e) for s, e in zip(bounds, bounds[1:]) if e > s]
+
+    def parse_sharded(self, fileName, func_for_element, processes=None, record_tag='entry', merge=None, tags=None):
+        """
+        分片并行解析：在记录标签边界处切分文件，由进程池分别解析各分片。
+        回调函数在子进程中执行，必须是可序列化的模块级函数，
+        其非 None 返回值按分片收集后交给 merge 合并。
+        :param fileName: XML文件路径
+        :param func_for_element: 元素处理回调函数
+        :param processes: 进程数，默认为 CPU 核数
+        :param record_tag: 记录标签（如 UniProt 的 entry）
+        :param merge: 合并函数，参数为按文件顺序排列的各分片结果列表；
+                      为 None 时按顺序拼接为一个列表
+        :param tags: 完整标签名列表，只处理这些标签的元素
+        :return: 合并后的结果
+        """
+        processes = processes or os.cpu_count() or 1
+        header, ranges = self.split_shards(fileName, processes, record_tag)
+        if not ranges:
+            print(f"警告: 文件 '{fileName}' 中没有找到 <{record_tag}> 记录")
+            return merge([]) if merge else []
+
+        footer = _root_footer(header)
+        tag = record_tag.encode()
+        with ProcessPoolExecutor(max_workers=min(processes, len(ranges))) as pool:
+            futures = [
+                pool.submit(_parse_shard, fileName, start, end, header, footer, tag, func_for_element, tags)
+                for start, end in ranges
+            ]
+            shard_results = [future.result() for future in futures]
+
+        count = sum(n for n, _ in shard_results)
+        print(f"分片解析完成: {len(ranges)} 个分片，共 {count} 条 <{record_tag}> 记录")
+        per_shard = [results for _, results in shard_results]
+        if merge:
+            return merge(per_shard)
+        return [result for results in per_shard for result in results]
+
+    @staticmethod
+    def _index_path(fileName, record_tag, key_tag):
+        """偏移索引文件路径，如 P00734.xml.entry.accession.idx"""
+        return f"{fileName}.{record_tag}.{key_tag}{_INDEX_SUFFIX}"
+
+    def build_index(self, fileName, record_tag='entry', key_tag='accession'):
+        """
+        扫描文件建立偏移索引并写入旁路索引文件：
+        每条记录以其第一个 key_tag 子元素的文本为键，记录字节偏移和长度。
+        （假设记录标签之间不互相嵌套，UniProt 的 entry 满足这一点）
+        :param fileName: XML文件路径
+        :param record_tag: 记录标签
+        :param key_tag: 作为键的子元素标签
+        :return: 索引的记录数
+        """
+        if _is_compressed(fileName):
+            # 压缩文件无法按字节偏移随机访问
+            print(f"错误: 压缩文件 '{fileName}' 不支持建立偏移索引，请先解压")
+            return 0
+        # 记录标签和键标签都允许带命名空间前缀（如 <u:entry>、<u:accession>）
+        start_pattern = _record_pattern(record_tag.encode())
+        end_pattern = _record_pattern(record_tag.encode(), closing=True)
+        name = re.escape(key_tag.encode())
+        key_pattern = re.compile(
+            rb'<(?:[^\s<>/!?:]+:)?' + name + rb'(?:\s[^>]*)?>([^<]*)</(?:[^\s<>/!?:]+:)?' + name + rb'\s*>')
+
+        st = os.stat(fileName)
+        index = {}
+        header = b''
+        with open(fileName, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while True:
+                match = start_pattern.search(mm, pos)
+                if match is None:
+                    break
+                start = match.start()
+                if not index and not header:
+                    header = mm[:start]
+                end = end_pattern.search(mm, start)
+                if end is None:
+                    break
+                end = end.end()
+                key = key_pattern.search(mm, start, end)
+                if key is not None:
+                    index.setdefault(key.group(1).strip().decode('utf-8'), (start, end - start))
+                pos = end
+
+        indexFile = self._index_path(fileName, record_tag, key_tag)
+        with open(indexFile, 'w', encoding='utf-8') as out:
+            out.write(f"{_INDEX_MAGIC}\t{st.st_size}\t{st.st_mtime_ns}\t{len(header)}\n")
+            for key, (offset, length) in index.items():
+                out.write(f"{key}\t{offset}\t{length}\n")
+        self._indexes[indexFile] = (header, index)
+        return len(index)
+
+    def _load_index(self, fileName, record_tag, key_tag):
+        """加载偏移索引；索引不存在或已过期（文件大小/修改时间变化）时重新建立"""
+        indexFile = self._index_path(fileName, record_tag, key_tag)
+        st = os.stat(fileName)
+        if indexFile not in self._indexes and path.isfile(indexFile):
+            with open(indexFile, encoding='utf-8') as f:
+                magic, size, mtime, header_len = f.readline().rstrip('\n').split('\t')
+                if magic == _INDEX_MAGIC and int(size) == st.st_size and int(mtime) == st.st_mtime_ns:
+                    index = {}
+                    for line in f:
+                        key, offset, length = line.rstrip('\n').split('\t')
+                        index[key] = (int(offset), int(length))
+                    with open(fileName, 'rb') as xml:
+                        header = xml.read(int(header_len))
+                    self._indexes[indexFile] = (header, index)
+        if indexFile not in self._indexes:
+            self.build_index(fileName, record_tag, key_tag)
+        return self._indexes[indexFile]
+
+    def lookup(self, fileName, key, record_tag='entry', key_tag='accession'):
+        """
+        通过偏移索引随机访问单条记录：用 mmap 定位并只解析该记录片段
+        :param fileName: XML文件路径
+        :param key: 记录键（如 UniProt 的首个 accession）
+        :param record_tag: 记录标签
+        :param key_tag: 作为键的子元素标签
+        :return: 记录元素，找不到时返回 None
+        """
+        if _is_compressed(fileName):
+            print(f"错误: 压缩文件 '{fileName}' 不支持随机访问，请先解压")
+            return None
+        header, index = self._load_index(fileName, record_tag, key_tag)
+        if key not in index:
+            return None
+        offset, length = index[key]
+        with open(fileName, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            fragment = mm[offset:offset + length]
+        # 补上文件头和根结束标签，使片段中的命名空间与完整解析时一致
+        root = etree.fromstring(header + fragment + _root_footer(header))
+        return root[-1]
+
+    @staticmethod
+    def _compile_field(spec, namespace):
+        """
+        把字段路径编译为取值函数：路径按 ElementPath 语法相对记录元素查找，
+        末尾的 /@attr 表示取属性值，否则取元素文本；找不到时返回 None
+        """
+        namespaces = {None: namespace} if namespace else None
+        elemPath, _, last = spec.rpartition('/')
+        if last.startswith('@'):
+            attr = last[1:]
+        else:
+            elemPath, attr = spec, ''
+        elemPath = elemPath or '.'
+        if attr:
+            def getter(record):
+                node = record.find(elemPath, namespaces)
+                return node.get(attr) if node is not None else None
+        else:
+            def getter(record):
+                node = record.find(elemPath, namespaces)
+                return node.text.strip() if node is not None and node.text else None
+        return getter
+
+    def extract(self, fileName, outDir, fields=None, record_tag='entry', batch_size=65536):
+        """
+        列式抽取：流式解析每条记录，按字段路径取值填入定长批次，批次满后按列追加写入 outDir。
+        数值列写为原始二进制（可用 np.memmap 直接读取），字符串列写为 UTF-8 数据加 int64 偏移，
+        列名、类型和行数记录在 _schema.json 中，用 read_columns 读取
+        :param fileName: XML文件路径，支持 .gz / .bz2 / .xz
+        :param outDir: 输出目录
+        :param fields: 列名 -> (路径, 类型)，类型为 'str' 或 NumPy 数值类型名，默认 UNIPROT_FIELDS；
+                       缺失值及无法转换为该类型的值：字符串为空串，整数为 0，浮点数为 NaN
+        :param record_tag: 记录标签
+        :param batch_size: 每批记录数
+        :return: 抽取的记录数
+        """
+        if np is None:
+            raise ImportError("列式抽取需要安装 NumPy: pip install numpy")
+        if not path.isfile(fileName):
+            print(f"错误: 文件 '{fileName}' 不存在")
+            return 0
+        fields = fields or UNIPROT_FIELDS
+        namespace = self.getNamespace(fileName)
+        names = list(fields)
+        getters = [self._compile_field(spec, namespace) for spec, _ in fields.values()]
+        dtypes = [None if dtype == 'str' else np.dtype(dtype).newbyteorder('<') for _, dtype in fields.values()]
+        missing = [np.nan if dtype is not None and dtype.kind == 'f' else 0 for dtype in dtypes]
+
+        os.makedirs(outDir, exist_ok=True)
+        files = []
+        offsets = []
+        for name, dtype in zip(names, dtypes):
+            files.append(open(path.join(outDir, name + '.bin'), 'wb'))
+            if dtype is None:
+                offsets.append(open(path.join(outDir, name + '.offsets'), 'wb'))
+                # 偏移数组以 0 开头，第 i 个字符串为 data[offsets[i]:offsets[i + 1]]
+                np.zeros(1, '<i8').tofile(offsets[-1])
+            else:
+                offsets.append(None)
+        # 每列一个定长批次：数值列为 NumPy 数组，字符串列为列表
+        batches = [[] if dtype is None else np.empty(batch_size, dtype) for dtype in dtypes]
+        ends = [0] * len(names)
+        filled = 0
+        rows = 0
+
+        def flush():
+            nonlocal filled
+            for i, batch in enumerate(batches):
+                if dtypes[i] is None:
+                    data = [value.encode('utf-8') for value in batch]
+                    lengths = np.fromiter(map(len, data), '<i8', len(data))
+                    files[i].write(b''.join(data))
+                    (ends[i] + np.cumsum(lengths)).tofile(offsets[i])
+                    ends[i] += int(lengths.sum())
+                    batch.clear()
+                else:
+                    batch[:filled].tofile(files[i])
+            filled = 0
+
+        def convert(i, value):
+            if dtypes[i] is None:
+                return value or ''
+            if value is None:
+                return missing[i]
+            try:
+                return dtypes[i].type(value)
+            except (ValueError, TypeError, OverflowError):
+                return missing[i]
+
+        def collect(record):
+            nonlocal filled, rows
+            # 整行的值全部取出并转换后才写入批次，任一字段出错都不会使各列行数不一致
+            values = [convert(i, getter(record)) for i, getter in enumerate(getters)]
+            for i, value in enumerate(values):
+                if dtypes[i] is None:
+                    batches[i].append(value)
+                else:
+                    batches[i][filled] = value
+            filled += 1
+            rows += 1
+            if filled == batch_size:
+                flush()
+
+        try:
+            self.parse(fileName, collect, tags=self.resolveTags(record_tag))
+            flush()
+        finally:
+            for f in files + offsets:
+                if f is not None:
+                    f.close()
+
+        schema = {
+            'source': path.abspath(fileName),
+            'record_tag': record_tag,
+            'rows': rows,
+            'columns': [{'name': name, 'path': spec, 'dtype': dtype} for name, (spec, dtype) in fields.items()],
+        }
+        with open(path.join(outDir, _COLUMN_SCHEMA), 'w', encoding='utf-8') as f:
+            json.dump(schema, f, ensure_ascii=False, indent=2)
+        return rows
+
+    @staticmethod
+    def read_columns(outDir, columns=None):
+        """
+        读取 extract 写出的列式数据，只读取所需的列
+        :param outDir: extract 的输出目录
+        :param columns: 列名列表，默认读取全部列
+        :return: 列名 -> 数据；数值列为只读 np.memmap，字符串列为 str 列表
+        """
+        if np is None:
+            raise ImportError("读取列式数据需要安装 NumPy: pip install numpy")
+        with open(path.join(outDir, _COLUMN_SCHEMA), encoding='utf-8') as f:
+            schema = json.load(f)
+        result = {}
+        for column in schema['columns']:
+            name = column['name']
+            if columns is not None and name not in columns:
+                continue
+            dataFile = path.join(outDir, name + '.bin')
+            if column['dtype'] == 'str':
+                ends = np.fromfile(path.join(outDir, name + '.offsets'), '<i8')
+                with open(dataFile, 'rb') as f:
+                    data = f.read()
+                result[name] = [data[a:b].decode('utf-8') for a, b in zip(ends[:-1].tolist(), ends[1:].tolist())]
+            elif schema['rows']:
+                result[name] = np.memmap(dataFile, np.dtype(column['dtype']).newbyteorder('<'), 'r',
+                                         shape=(schema['rows'],))
+            else:
+                result[name] = np.empty(0, np.dtype(column['dtype']))
+        return result
@@ -5,28 +5,44 @@
 import random
 import string
 from functools import wraps
+from itertools import chain
 import atexit
-# 全局变量用于存储所有样本的数值
-all_numbers = []
-def extract_numbers(data):
+def extract_numbers(data, out=None):
     """
-    递归提取数据结构中的所有数值（整数和浮点数）
+    提取数据结构中的所有数值（整数和浮点数）
     参数:
     data: 任意数据结构（支持嵌套）
+    out: 追加数值的缓冲区，默认新建列表
     
     返回:
-    list: 提取到的数值列表
+    list: 提取到的数值列表（即 out）
     """
-    numbers = []
-    if isinstance(data, (int, float)):
-        numbers.append(data)
-    elif isinstance(data, (list, tuple)):
-        for item in data:
-            numbers.extend(extract_numbers(item))
-    elif isinstance(data, dict):
-        for key, value in data.items():
-            numbers.extend(extract_numbers(key))
-            numbers.extend(extract_numbers(value))
+    numbers = [] if out is None else out
+    append = numbers.append
+    # 用显式栈代替递归，嵌套再深也不会超出递归深度限制
+    stack = [iter((data,))]
+    while stack:
+        for item in stack[-1]:
+            cls = type(item)
+            # 快速路径：先按精确类型判断，最常见的情况不必走 isinstance
+            if cls is int or cls is float:
+                append(item)
+            elif cls is list or cls is tuple:
+                stack.append(iter(item))
+                break
+            elif cls is dict:
+                stack.append(chain.from_iterable(item.items()))
+                break
+            elif isinstance(item, (int, float)):
+                append(item)
+            elif isinstance(item, (list, tuple)):
+                stack.append(iter(item))
+                break
+            elif isinstance(item, dict):
+                stack.append(chain.from_iterable(item.items()))
+                break
+        else:
+            stack.pop()
     return numbers
 
 def statistics_decorator(operations):
@@ -42,22 +58,34 @@ def statistics_decorator(operations):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
+            totals = wrapper.totals
+            # 本次调用的缓冲区：每个样本的数值提取到这里，累计到 totals 后清空
+            numbers = []
             gen = func(*args, **kwargs)
             for sample in gen:
-                # 提取当前样本中的所有数值并添加到全局列表
-                all_numbers.extend(extract_numbers(sample))
+                extract_numbers(sample, numbers)
+                if numbers:
+                    totals['count'] += len(numbers)
+                    totals['SUM'] += sum(numbers)
+                    high, low = max(numbers), min(numbers)
+                    totals['MAX'] = high if totals['MAX'] is None else max(totals['MAX'], high)
+                    totals['MIN'] = low if totals['MIN'] is None else min(totals['MIN'], low)
+                    numbers.clear()
                 yield sample
+        # 所有调用累计的统计量，只保存数值个数、和、最大值、最小值
+        wrapper.totals = {'count': 0, 'SUM': 0, 'MAX': None, 'MIN': None}
         return wrapper
     return decorator
 
-def print_global_statistics(operations):
+def print_global_statistics(totals, operations):
     """
     打印全局统计结果
     
     参数:
+    totals (dict): 装饰后函数的累计统计量（即 func.totals）
     operations (list): 需要执行的统计操作列表
     """
-    if not all_numbers:
+    if not totals['count']:
         print("没有收集到任何数值数据")
         return
     
@@ -67,30 +95,33 @@ def print_global_statistics(operations):
     
     stats = {}
     if 'SUM' in operations:
-        stats['SUM'] = sum(all_numbers)
+        stats['SUM'] = totals['SUM']
     if 'AVG' in operations:
-        stats['AVG'] = sum(all_numbers) / len(all_numbers)
+        stats['AVG'] = totals['SUM'] / totals['count']
     if 'MAX' in operations:
-        stats['MAX'] = max(all_numbers)
+        stats['MAX'] = totals['MAX']
     if 'MIN' in operations:
-        stats['MIN'] = min(all_numbers)
+        stats['MIN'] = totals['MIN']
     
     for op, value in stats.items():
         print(f"{op}: {value:.4f}" if isinstance(value, float) else f"{op}: {value}")
     
-    print(f"统计样本数量: {len(all_numbers)}个数值")
+    print(f"统计样本数量: {totals['count']}个数值")
     print("="*50)
 
-def generate_sample(structure):
+def generate_sample(structure, rng=None):
     """
     递归生成样本数据
     
     参数:
     structure (dict): 描述数据结构的字典
+    rng (random.Random): 随机数生成器，默认使用 random 模块的全局生成器；
+        传入 random.Random(seed) 可复现结果，需要密码学安全的随机数时显式传入 random.SystemRandom()
     
     返回:
     根据structure生成的样本数据
     """
+    rng = rng or random
     if not isinstance(structure, dict):
         return structure
     
@@ -100,19 +131,19 @@ def generate_sample(structure):
         params = list(structure.values())[0]
         
         if data_type == list:
-            length = params.get('length', random.randint(1, 5))
+            length = params.get('length', rng.randint(1, 5))
             element_structure = params.copy()
             element_structure.pop('length', None)
-            return [generate_sample(element_structure) for _ in range(length)]
+            return [generate_sample(element_structure, rng) for _ in range(length)]
         
         elif data_type == tuple:
-            length = params.get('length', random.randint(1, 5))
+            length = params.get('length', rng.randint(1, 5))
             element_structure = params.copy()
             element_structure.pop('length', None)
-            return tuple(generate_sample(element_structure) for _ in range(length))
+            return tuple(generate_sample(element_structure, rng) for _ in range(length))
         
         elif data_type == dict:
-            length = params.get('length', random.randint(1, 3))
+            length = params.get('length', rng.randint(1, 3))
             key_type = params.get('key_type', int)
             value_structure = params.copy()
             value_structure.pop('length', None)
@@ -121,12 +152,12 @@ def generate_sample(structure):
             result = {}
             for _ in range(length):
                 if key_type == int:
-                    key = random.randint(0, 100)
+                    key = rng.randint(0, 100)
                 elif key_type == str:
-                    key = ''.join(random.choices(string.ascii_lowercase, k=3))
+                    key = ''.join(rng.choices(string.ascii_lowercase, k=3))
                 else:
                     key = _
-                result[key] = generate_sample(value_structure)
+                result[key] = generate_sample(value_structure, rng)
             return result
     
     # 处理普通类型
@@ -137,31 +168,31 @@ def generate_sample(structure):
         
         if data_type == int:
             min_val, max_val = params['datarange']
-            value = random.randint(min_val, max_val)
+            value = rng.randint(min_val, max_val)
             constraint = params.get('constraint', lambda x: True)
             while not constraint(value):
-                value = random.randint(min_val, max_val)
+                value = rng.randint(min_val, max_val)
             result[data_type] = value
             
         elif data_type == float:
             min_val, max_val = params['datarange']
-            value = random.uniform(min_val, max_val)
+            value = rng.uniform(min_val, max_val)
             constraint = params.get('constraint', lambda x: True)
             while not constraint(value):
-                value = random.uniform(min_val, max_val)
+                value = rng.uniform(min_val, max_val)
             result[data_type] = value
             
         elif data_type == str:
             char_set = params['datarange']
             length = params['len']
-            value = ''.join(random.choices(char_set, k=length))
+            value = ''.join(rng.choices(char_set, k=length))
             constraint = params.get('constraint', lambda x: True)
             while not constraint(value):
-                value = ''.join(random.choices(char_set, k=length))
+                value = ''.join(rng.choices(char_set, k=length))
             result[data_type] = value
             
         else:  # 嵌套结构
-            result[data_type] = generate_sample(params)
+            result[data_type] = generate_sample(params, rng)
     
     return result
 
@@ -169,25 +200,26 @@ def generate_sample(structure):
 OPERATIONS = ['SUM', 'AVG', 'MAX', 'MIN']
 
 @statistics_decorator(operations=OPERATIONS)
-def generate(structure):
+def generate(structure, rng=None):
     """
     生成器函数，根据给定结构无限生成样本数据（已添加统计装饰器）
     
     参数:
     structure (dict): 描述数据结构的字典
+    rng (random.Random): 随机数生成器，规则与 generate_sample 相同
     
     返回:
     generator: 生成样本数据的生成器
     """
     while True:
-        yield generate_sample(structure)
+        yield generate_sample(structure, rng)
 
 def main():
     """
     主函数：定义数据结构并生成10000个样本数据
     """
     # 注册退出处理函数，在程序结束时打印全局统计
-    atexit.register(print_global_statistics, OPERATIONS)
+    atexit.register(print_global_statistics, generate.totals, OPERATIONS)
     
     struct = {
         tuple: {
@@ -7,6 +7,9 @@ from collections import defaultdict
 from optparse import OptionParser
 import logging
 
+# 命名空间缓存，键为 (文件路径, 修改时间, 文件大小)，同一文件只读取一次文件头
+_namespace_cache = {}
+
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -36,7 +39,12 @@ class XMLDealer:
         logging.info(f"正在处理文件: {fileName}, 解析标签: {elemTag}")
 
     def _getNamespaces(self, fileName):
-        """获取XML文件的所有命名空间，处理无命名空间的情况"""
+        """获取XML文件头（根元素）声明的命名空间，处理无命名空间的情况，结果按文件缓存"""
+        st = os.stat(fileName)
+        key = (os.path.abspath(fileName), st.st_mtime_ns, st.st_size)
+        if key in _namespace_cache:
+            return set(_namespace_cache[key])
+
         namespaces = set()
         try:
             # 尝试读取文件前几行，检查是否为有效XML
@@ -45,10 +53,14 @@ class XMLDealer:
                 if '<?xml' not in header:
                     logging.warning(f"文件可能不是有效的XML: {fileName}")
             
-            context = etree.iterparse(fileName, events=('start-ns',))
+            # 命名空间声明出现在根元素的 start 事件之前，读到根元素即可停止，无需扫描整个文件
+            context = etree.iterparse(fileName, events=('start-ns', 'start'))
             for event, elem in context:
+                if event == 'start':
+                    break
                 prefix, ns = elem
                 namespaces.add(ns)
+            _namespace_cache[key] = frozenset(namespaces)
         except Exception as e:
             logging.error(f"获取命名空间时出错: {e}")
         finally:
@@ -43,6 +43,43 @@ def merge_trees(tree1, tree2):
     return dict(merged)
 
 
+def stream_tag_tree(xml_file):
+    """
+    基于 iterparse 的 start/end 事件流式构建标签树，
+    每个元素处理完即释放，内存只与不同路径的数量有关、与文档大小无关。
+    返回 (标签树, 路径计数)，标签树结构与 build_tag_tree 相同，可直接交给 print_tree。
+    """
+    tag_tree = {}
+    counts = defaultdict(int)
+    # 栈中保存 (元素, 该元素在标签树中的子节点字典, 当前路径)
+    stack = []
+
+    for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+        if event == 'start':
+            tag = elem.tag
+            if stack:
+                _, siblings, parent_path = stack[-1]
+                current_path = f"{parent_path}/{tag}"
+                # 与 build_tag_tree 相同，子节点的值为 {标签: 子节点字典}
+                children = siblings.setdefault(tag, {tag: {}})[tag]
+            else:
+                current_path = tag
+                children = tag_tree.setdefault(tag, {})
+            counts[current_path] += 1
+            stack.append((elem, children, current_path))
+        else:
+            elem, children, current_path = stack.pop()
+            # 属性作为特殊的"标签"，与 build_tag_tree 一样排在子元素之后
+            for attr in elem.attrib:
+                children.setdefault(f"@{attr}", {})
+            # 释放已处理的元素，只保留当前路径上的祖先
+            elem.clear()
+            if stack:
+                stack[-1][0].remove(elem)
+
+    return tag_tree, dict(counts)
+
+
 def print_tree(tree, level=0, prefix=""):
     """格式化打印标签树"""
     for tag, children in tree.items():
@@ -57,12 +94,8 @@ def main():
     args = parser.parse_args()
 
     try:
-        # 解析XML文件
-        tree = ET.parse(args.xml_file)
-        root = tree.getroot()
-
-        # 构建标签树
-        tag_tree = build_tag_tree(root)
+        # 流式解析XML文件并构建标签树
+        tag_tree, _ = stream_tag_tree(args.xml_file)
 
         # 打印标签树
         print(f"XML文件 '{args.xml_file}' 的标签树结构：")
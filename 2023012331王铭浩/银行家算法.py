@@ -161,6 +161,64 @@ def is_system_safe(Available, Max, Need, Allocated):
         print(f"  未完成的进程: {unfinished}")
         return False, [], safety_steps
 
+def is_system_safe_fast(Available, Need, Allocated):
+    """
+    安全性检查的向量化版本（不打印任何信息）
+
+    每一轮用一次矩阵比较找出所有 Need <= Work 的未完成进程，并让它们同时完成。
+    进程完成只会让 Work 增大，所以同一轮中可运行的进程按任意顺序完成都合法，
+    结果与逐个扫描的 is_system_safe 一致，最多 n_processes 轮。
+
+    参数:
+    Available: 可用资源向量，形状为(n_resources,)
+    Need: 还需要的资源矩阵，形状为(n_processes, n_resources)
+    Allocated: 已分配资源矩阵，形状为(n_processes, n_resources)
+
+    返回:
+    tuple: (是否安全, 安全序列)
+    """
+    # Work 的类型要能容纳 Available 与 Allocated 相加的结果（如整数 Available 加浮点 Allocated）
+    Work = np.array(Available, dtype=np.result_type(np.asarray(Available), Allocated))
+    Finish = np.zeros(Need.shape[0], dtype=bool)
+    safe_sequence = []
+
+    while not Finish.all():
+        runnable = ~Finish & np.all(Need <= Work, axis=1)
+        if not runnable.any():
+            return False, []
+        Work += Allocated[runnable].sum(axis=0)
+        Finish |= runnable
+        safe_sequence.extend(np.flatnonzero(runnable).tolist())
+
+    return True, safe_sequence
+
+def is_system_safe_batch(Available, Need, Allocated):
+    """
+    批量检查多个系统状态是否安全（不打印任何信息）
+
+    所有状态一起推进：每一轮对整批状态做一次 (batch, n_processes, n_resources) 的比较，
+    适合容量规划模拟中一次评估成千上万个状态。
+
+    参数:
+    Available: 可用资源，形状为(batch, n_resources)
+    Need: 还需要的资源，形状为(batch, n_processes, n_resources)
+    Allocated: 已分配资源，形状为(batch, n_processes, n_resources)
+
+    返回:
+    np.ndarray: 形状为(batch,)的布尔数组，表示每个状态是否安全
+    """
+    Work = np.array(Available, dtype=np.result_type(np.asarray(Available), Allocated))
+    Finish = np.zeros(Need.shape[:2], dtype=bool)
+
+    while True:
+        runnable = ~Finish & np.all(Need <= Work[:, None, :], axis=2)
+        if not runnable.any():
+            break
+        Work += np.einsum('bn,bnm->bm', runnable.astype(Allocated.dtype), Allocated)
+        Finish |= runnable
+
+    return Finish.all(axis=1)
+
 # 测试示例
 def test_bankers_algorithm():
     # 定义示例数据
@@ -234,6 +292,8 @@ def test_bankers_algorithm():
 
 if __name__ == "__main__":
     test_bankers_algorithm()
+
+"""
 代码运行结果如下：
 运行结果===== 测试案例1: 进程1请求资源[1, 0, 2] =====
 ===== 银行家算法资源分配 =====
@@ -476,3 +536,4 @@ if __name__ == "__main__":
 
 资源分配结果:
 是否可以分配: False
+"""
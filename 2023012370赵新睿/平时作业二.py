@@ -1,6 +1,324 @@
+import ast
+import bisect
+import inspect
+import math
 import random
 import string
-from typing import Dict, Any, Union, List, Tuple
+import textwrap
+from typing import Dict, Any, Union, List, Tuple, Callable, Optional
+
+# 合并多个取模条件时，合并后的模数超过该值就不再列举余数（单个取模条件不受限制）
+_MAX_COMBINED_MODULUS = 1000000
+
+
+def _code_key(code) -> Tuple:
+    """
+    代码对象的比较键：字节码、常量（连同类型，区分 5 与 5.0）、引用的名字和局部变量名，
+    不含行号等位置信息，因此重新编译的源码片段可以和原函数比较
+    """
+    consts = tuple(_code_key(c) if inspect.iscode(c) else (type(c), c) for c in code.co_consts)
+    return code.co_code, consts, code.co_names, code.co_varnames
+
+
+def _lambda_expression(func: Callable) -> Optional[Tuple[str, ast.expr]]:
+    """
+    取出单参数 lambda（或只有一条 return 语句的函数）的参数名和表达式语法树
+
+    源码中可能在同一行有多个 lambda，逐个截取可解析的 lambda 表达式重新编译，
+    字节码、常量和名字都与 func 一致的才是它本身（只比较字节码时 x > 5 与 x > 7 无法区分）；
+    取不到源码或无法确定时返回 None
+
+    返回:
+        (参数名, 表达式) 或 None
+    """
+    code = getattr(func, '__code__', None)
+    if code is None or code.co_argcount != 1:
+        return None
+    try:
+        source = textwrap.dedent(inspect.getsource(func))
+    except (OSError, TypeError):
+        return None
+
+    if func.__name__ != '<lambda>':
+        try:
+            node = ast.parse(source).body[0]
+        except (SyntaxError, IndexError):
+            return None
+        if (isinstance(node, ast.FunctionDef) and len(node.body) == 1
+                and isinstance(node.body[0], ast.Return) and node.body[0].value is not None):
+            return node.args.args[0].arg, node.body[0].value
+        return None
+
+    key = _code_key(code)
+    start = source.find('lambda')
+    while start != -1:
+        # 从最长的片段开始尝试，第一个能解析的片段里包含了从这里开始的 lambda 表达式
+        # （片段可能是 "lambda x: x > 5, lambda x: x > 7" 这样的元组，所以逐个检查其中的 lambda）
+        for end in range(len(source), start, -1):
+            try:
+                tree = ast.parse(source[start:end], mode='eval')
+            except SyntaxError:
+                continue
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Lambda):
+                    compiled = compile(ast.Expression(node), '<constraint>', 'eval').co_consts
+                    if any(inspect.iscode(c) and _code_key(c) == key for c in compiled):
+                        return node.args.args[0].arg, node.body
+            break
+        start = source.find('lambda', start + 1)
+    return None
+
+
+class _RangeUnion:
+    """若干个 range 的并集，可按下标访问，供 choices 在其中均匀抽样"""
+
+    def __init__(self, ranges: List[range]):
+        self._ranges = [r for r in ranges if len(r)]
+        self._ends = []
+        total = 0
+        for r in self._ranges:
+            total += len(r)
+            self._ends.append(total)
+
+    def __len__(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def __getitem__(self, index: int) -> int:
+        i = bisect.bisect_right(self._ends, index)
+        return self._ranges[i][index - (self._ends[i - 1] if i else 0)]
+
+
+class ConstraintSampler:
+    """
+    带约束条件的取值器，替代"随机生成直到满足约束"的无界循环
+
+    - 识别约束中常见形式的条件（用 and 连接）：
+      上下界 x > c、a <= x < b，取值集合 x in (...)，奇偶/取模 x % m == r，
+      字符串前缀 s.startswith(...)、s[0] in '...'，直接在缩小后的取值范围内抽样
+    - 其余条件按批次生成候选值再过滤（批次大小随接受率调整），
+      单次取值的尝试次数超过 max_attempts 时报错，不会无限循环
+    - 缩小后的范围内抽出的值同样用完整约束检查，结果与拒绝采样的分布一致；
+      缩小后的范围内找不到满足约束的值时（条件识别有误），退回在原取值范围内批量拒绝
+    - 候选值由纯 Python 按批生成（本文件不依赖 NumPy），随机数来自传入的 rng
+    """
+
+    def __init__(self, data_type: type, rules: Dict, max_attempts: int = 100000, batch_size: int = 64,
+                 rng: Optional[random.Random] = None):
+        """
+        参数:
+            data_type: int / float / str
+            rules: 类型的生成规则，包含 'datarange'、'constraint'（字符串还有 'len'）
+            max_attempts: 单次取值最多尝试的候选值个数
+            batch_size: 每批最少生成的候选值个数
+            rng: 随机数生成器，默认使用 random 模块的全局生成器；传入 random.Random(seed) 可复现结果
+        """
+        self.data_type = data_type
+        self.predicate = rules['constraint']
+        self.max_attempts = max_attempts
+        self.batch_size = batch_size
+        self.rng = rng or random
+        self.attempts = 0
+        self.accepted = 0
+        self._buffer = []
+
+        # 识别出的条件: [(种类, 参数), ...]
+        parsed = _lambda_expression(self.predicate)
+        conditions = self._conditions(*parsed) if parsed else []
+        self.reduced = bool(conditions)
+        self._draw = self._domain(rules, conditions)
+        if self.reduced:
+            # 先在缩小后的范围内取一批值，确认其中确有满足完整约束的值
+            try:
+                self._refill()
+            except ValueError:
+                self.reduced = False
+                self._draw = self._domain(rules, [])
+                self.attempts = self.accepted = 0
+
+    def _domain(self, rules: Dict, conditions: List) -> Callable[[int], List[Any]]:
+        """按类型和识别出的条件构造候选值生成函数"""
+        if self.data_type is int:
+            return self._int_domain(rules['datarange'], conditions)
+        if self.data_type is float:
+            return self._float_domain(rules['datarange'], conditions)
+        return self._str_domain(rules['datarange'], rules['len'], conditions)
+
+    @classmethod
+    def _conditions(cls, name: str, node: ast.expr) -> List[Tuple[str, Any]]:
+        """把约束表达式拆分为可识别的条件，无法识别的部分忽略（仍由完整约束检查）"""
+        if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+            return [c for value in node.values for c in cls._conditions(name, value)]
+
+        def is_var(n):
+            return isinstance(n, ast.Name) and n.id == name
+
+        def const(n):
+            try:
+                return True, ast.literal_eval(n)
+            except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                return False, None
+
+        # s.startswith('ab') / s.startswith(('a', 'b'))
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and is_var(node.func.value)
+                and node.func.attr == 'startswith' and len(node.args) == 1 and not node.keywords):
+            ok, value = const(node.args[0])
+            if ok:
+                return [('prefix', (value,) if isinstance(value, str) else tuple(value))]
+            return []
+
+        if not isinstance(node, ast.Compare):
+            return []
+        conditions = []
+        flipped = {ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE, ast.Eq: ast.Eq}
+        operands = [node.left] + node.comparators
+        for left, op, right in zip(operands, node.ops, operands[1:]):
+            # 统一为 "变量表达式 op 常量" 的形式
+            ok, value = const(right)
+            if not ok:
+                ok, value = const(left)
+                if not ok or type(op) not in flipped:
+                    continue
+                left, op = right, flipped[type(op)]()
+            if is_var(left):
+                if isinstance(op, (ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq)):
+                    conditions.append((type(op).__name__, value))
+                elif isinstance(op, ast.In):
+                    conditions.append(('In', value))
+            elif (isinstance(left, ast.BinOp) and isinstance(left.op, ast.Mod) and is_var(left.left)
+                  and isinstance(op, (ast.Eq, ast.NotEq))):
+                ok, modulus = const(left.right)
+                if ok and isinstance(modulus, int) and modulus > 0 and isinstance(value, int):
+                    if isinstance(op, ast.Eq):
+                        conditions.append(('Mod', (modulus, {value % modulus})))
+                    elif modulus <= _MAX_COMBINED_MODULUS:
+                        # != 只排除一个余数，模数很大时几乎不缩小范围，不值得列举其余余数
+                        conditions.append(('Mod', (modulus, set(range(modulus)) - {value % modulus})))
+            elif (isinstance(left, ast.Subscript) and is_var(left.value) and isinstance(op, (ast.In, ast.Eq))
+                  and const(left.slice) == (True, 0)):
+                # s[0] in 'abc' / s[0] == 'a'
+                conditions.append(('prefix', tuple(value)))
+        return conditions
+
+    def _int_domain(self, datarange: Tuple[int, int], conditions: List) -> Callable[[int], List[int]]:
+        """整数：按上下界、取值集合和取模条件缩小取值范围"""
+        lo, hi = datarange
+        choices = None
+        mods = []
+        for kind, value in conditions:
+            if kind == 'Gt':
+                lo = max(lo, math.floor(value) + 1)
+            elif kind == 'GtE':
+                lo = max(lo, math.ceil(value))
+            elif kind == 'Lt':
+                hi = min(hi, math.ceil(value) - 1)
+            elif kind == 'LtE':
+                hi = min(hi, math.floor(value))
+            elif kind in ('Eq', 'In'):
+                try:
+                    values = [value] if kind == 'Eq' else list(value)
+                except TypeError:
+                    continue
+                # 与整数相等的浮点数（如 5.0）同样可以取到，统一转换为 int
+                values = {int(v) for v in values
+                          if isinstance(v, (int, float)) and math.isfinite(v) and v == int(v)}
+                choices = values if choices is None else choices & values
+            elif kind == 'Mod':
+                mods.append(value)
+
+        modulus, residues = 1, {0}
+        if len(mods) == 1:
+            # 单个取模条件直接按余数生成等差数列，模数再大也不需要列举
+            modulus, residues = mods[0]
+        else:
+            for m, allowed in mods:
+                combined = modulus * m // math.gcd(modulus, m)
+                if combined > _MAX_COMBINED_MODULUS:
+                    # 合并后模数过大时不再合并，交给完整约束检查
+                    continue
+                residues = {r for r in range(combined) if r % modulus in residues and r % m in allowed}
+                modulus = combined
+
+        if choices is not None:
+            # 取值集合是有限的，直接用完整约束逐个检查，缩小后的集合与约束的解完全一致
+            population = sorted(v for v in choices
+                                if lo <= v <= hi and v % modulus in residues and self.predicate(v))
+        else:
+            population = _RangeUnion([range(lo + (r - lo) % modulus, hi + 1, modulus) for r in sorted(residues)])
+        if not len(population):
+            raise ValueError(f"约束条件在取值范围 {datarange} 内无解")
+        choose = self.rng.choices
+        return lambda n: choose(population, k=n)
+
+    def _float_domain(self, datarange: Tuple[float, float], conditions: List) -> Callable[[int], List[float]]:
+        """浮点数：按上下界缩小取值区间"""
+        lo, hi = datarange
+        for kind, value in conditions:
+            if kind in ('Gt', 'GtE'):
+                lo = max(lo, value)
+            elif kind in ('Lt', 'LtE'):
+                hi = min(hi, value)
+        if lo > hi:
+            raise ValueError(f"约束条件在取值范围 {datarange} 内无解")
+        uniform = self.rng.uniform
+        return lambda n: [uniform(lo, hi) for _ in range(n)]
+
+    def _str_domain(self, chars: str, length: int, conditions: List) -> Callable[[int], List[str]]:
+        """字符串：有前缀条件时先按权重抽取前缀，再随机生成其余字符"""
+        prefixes = None
+        for kind, value in conditions:
+            if kind == 'prefix':
+                candidates = {p for p in value if len(p) <= length and all(c in chars for c in p)}
+                # 多个前缀条件同时成立时，只保留能同时满足的前缀（取较长的那个）
+                prefixes = candidates if prefixes is None else (
+                    {p for p in candidates if any(p.startswith(q) for q in prefixes)}
+                    | {q for q in prefixes if any(q.startswith(p) for p in candidates)})
+        choices = self.rng.choices
+        if prefixes is None:
+            return lambda n: [''.join(choices(chars, k=length)) for _ in range(n)]
+        # 去掉被更短前缀覆盖的前缀，使各前缀对应的字符串互不重叠
+        prefixes = sorted(p for p in prefixes if not any(p != q and p.startswith(q) for q in prefixes))
+        if not prefixes:
+            raise ValueError("约束条件要求的前缀无法由给定字符生成")
+        # 每个前缀按其后可能的字符串个数加权，保证在满足条件的字符串中均匀抽样
+        weights = [len(set(chars)) ** (length - len(p)) for p in prefixes]
+        return lambda n: [p + ''.join(choices(chars, k=length - len(p)))
+                          for p in choices(prefixes, weights=weights, k=n)]
+
+    def sample(self) -> Any:
+        """取一个满足约束条件的值"""
+        if not self._buffer:
+            self._refill()
+        return self._buffer.pop()
+
+    def _refill(self):
+        """批量生成候选值并过滤，直到至少有一个满足约束"""
+        tried = 0
+        while not self._buffer:
+            if tried >= self.max_attempts:
+                raise ValueError(f"约束条件在 {self.max_attempts} 次尝试内未能满足，"
+                                 f"当前接受率 {self.acceptance_rate:.2%}")
+            # 按已观察到的接受率估计需要的候选数，至少 batch_size 个
+            rate = self.accepted / self.attempts if self.accepted else 0.0
+            n = self.batch_size if rate == 0 else max(self.batch_size, math.ceil(1 / rate))
+            n = min(n, self.max_attempts - tried)
+            self._buffer = [value for value in self._draw(n) if self.predicate(value)]
+            tried += n
+            self.attempts += n
+            self.accepted += len(self._buffer)
+
+    @property
+    def acceptance_rate(self) -> float:
+        return self.accepted / self.attempts if self.attempts else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """接受率统计"""
+        return {
+            'type': self.data_type.__name__,
+            'mode': '缩小范围' if self.reduced else '批量拒绝',
+            'attempts': self.attempts,
+            'accepted': self.accepted,
+            'acceptance_rate': self.acceptance_rate,
+        }
 
 
 class RandomSampleGenerator:
@@ -15,8 +333,34 @@ class RandomSampleGenerator:
     - 完善的错误处理
     """
 
-    def __init__(self):
+    def __init__(self, max_attempts: int = 100000, rng: Optional[random.Random] = None):
+        """
+        参数:
+            max_attempts: 带约束条件的值单次取值最多尝试的候选值个数
+            rng: 随机数生成器，默认使用 random 模块的全局生成器；传入 random.Random(seed) 可复现结果
+        """
         self.supported_types = {int, float, str, list, tuple, dict}
+        self.max_attempts = max_attempts
+        self.rng = rng or random
+        # 各生成规则对应的约束取值器: id(规则) -> (规则, ConstraintSampler)
+        self._constraint_samplers = {}
+
+    def _constrained(self, data_type: type, rules: Dict) -> Any:
+        """用该规则对应的 ConstraintSampler 取一个满足约束的值"""
+        entry = self._constraint_samplers.get(id(rules))
+        if entry is None or entry[0] is not rules:
+            entry = (rules, ConstraintSampler(data_type, rules, self.max_attempts, rng=self.rng))
+            self._constraint_samplers[id(rules)] = entry
+        return entry[1].sample()
+
+    def constraint_stats(self) -> List[Dict[str, Any]]:
+        """
+        各约束条件的取值统计
+
+        返回:
+            每个约束一项: 类型、取值方式（缩小范围/批量拒绝）、尝试次数、接受次数、接受率
+        """
+        return [sampler.stats() for _, sampler in self._constraint_samplers.values()]
 
     def _generate_value(self, type_def: Dict[type, Dict]) -> Any:
         """
@@ -41,26 +385,20 @@ class RandomSampleGenerator:
             if 'datarange' not in rules or len(rules['datarange']) != 2:
                 raise ValueError("整数类型需要'datarange'参数，且必须是长度为2的元组")
 
-            min_val, max_val = rules['datarange']
-            value = random.randint(min_val, max_val)
-
             if 'constraint' in rules:
-                while not rules['constraint'](value):
-                    value = random.randint(min_val, max_val)
-            return value
+                return self._constrained(int, rules)
+            min_val, max_val = rules['datarange']
+            return self.rng.randint(min_val, max_val)
 
         # 生成浮点数
         elif data_type is float:
             if 'datarange' not in rules or len(rules['datarange']) != 2:
                 raise ValueError("浮点数类型需要'datarange'参数，且必须是长度为2的元组")
 
-            min_val, max_val = rules['datarange']
-            value = random.uniform(min_val, max_val)
-
             if 'constraint' in rules:
-                while not rules['constraint'](value):
-                    value = random.uniform(min_val, max_val)
-            return value
+                return self._constrained(float, rules)
+            min_val, max_val = rules['datarange']
+            return self.rng.uniform(min_val, max_val)
 
         # 生成字符串
         elif data_type is str:
@@ -69,14 +407,11 @@ class RandomSampleGenerator:
             if 'len' not in rules:
                 raise ValueError("字符串类型需要'len'参数")
 
+            if 'constraint' in rules:
+                return self._constrained(str, rules)
             chars = rules['datarange']
             length = rules['len']
-            value = ''.join(random.choice(chars) for _ in range(length))
-
-            if 'constraint' in rules:
-                while not rules['constraint'](value):
-                    value = ''.join(random.choice(chars) for _ in range(length))
-            return value
+            return ''.join(self.rng.choice(chars) for _ in range(length))
 
         # 生成字典
         elif data_type is dict:
@@ -174,4 +509,8 @@ if __name__ == "__main__":
 
     # 打印结果
     for i, sample in enumerate(samples, 1):
-        print(f"样本 {i}: {sample}")
\ No newline at end of file
+        print(f"样本 {i}: {sample}")
+
+    # 约束条件的取值统计
+    for stats in generator.constraint_stats():
+        print(f"约束 {stats['type']}: {stats['mode']}，接受率 {stats['acceptance_rate']:.2%}")
\ No newline at end of file
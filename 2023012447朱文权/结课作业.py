@@ -7,12 +7,15 @@
 """
 
 from lxml import etree
-from os import path
+from os import path, stat
 from optparse import OptionParser
 from pygments.lexer import default
 
 from callDealer import dealwithElement
 
+# Namespace cache keyed by (path, mtime, size), so each file header is read once
+_namespaceCache = {}
+
 class largeXMLDealer:
     """
 
@@ -51,17 +54,25 @@ class largeXMLDealer:
         return count
 
     def _getNamespace(self, fileName):
-        """"""
+        """Return the first namespace declared in the file header (cached per file)"""
         if not path.isfile(fileName) or not fileName.endswith("xml"):
             raise FileNotFoundError
+        st = stat(fileName)
+        key = (path.abspath(fileName), st.st_mtime_ns, st.st_size)
+        if key in _namespaceCache:
+            return _namespaceCache[key]
+
         result = ''
-        es = ('start-ns',)
+        # Namespace declarations come before the root 'start' event,
+        # so stop there instead of scanning the whole file
+        es = ('start-ns', 'start')
         context = etree.iterparse(fileName, events=es)
         for event, elem in context:
-            prefix, result = elem
-            # print("%s, %d"%(elem, len(elem)))
+            if event == 'start-ns':
+                prefix, result = elem
             break
         del context
+        _namespaceCache[key] = result
         return result
     def __call__(self,func):
         def wrapper():
@@ -96,10 +96,95 @@ def extract_numbers(data: Any) -> List[Union[int, float]]:
 
     return numbers
 
-def statistics(*metrics: str) -> Callable:
+class KLLSketch:
+    """
+    KLL 分位数草图：可合并、内存有界的近似分位数估计
+
+    第 h 层压缩器中的每个元素代表 2^h 个原始数值；某层超出容量时排序后随机保留
+    奇数位或偶数位的一半元素提升到上一层。总元素数约为 3k，排名误差约为 O(1/k)。
+
+    参数:
+        k: 精度参数，越大越精确（默认 200，排名误差约 1%）
+        seed: 压缩时随机选择保留位置所用的种子
+    """
+
+    def __init__(self, k: int = 200, seed: Union[int, None] = None):
+        self.k = k
+        self.count = 0
+        self.levels: List[List[float]] = [[]]
+        self._random = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        """第 level 层的容量，越低的层容量越小（按 2/3 的比例递减）"""
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self) -> None:
+        """从低层到高层依次压缩超出容量的层"""
+        for level in range(len(self.levels)):
+            if len(self.levels[level]) >= self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                items = sorted(self.levels[level])
+                # 个数为奇数时保留一个元素在本层，保证总权重不变
+                keep = [items.pop()] if len(items) % 2 else []
+                offset = self._random.randint(0, 1)
+                self.levels[level + 1].extend(items[offset::2])
+                self.levels[level] = keep
+
+    def update(self, value: Union[int, float]) -> None:
+        """加入一个数值"""
+        self.levels[0].append(value)
+        self.count += 1
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def extend(self, values: List[Union[int, float]]) -> None:
+        """加入一批数值"""
+        for value in values:
+            self.update(value)
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """合并另一个草图（如其他线程/进程的统计结果），返回自身"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantile(self, q: float) -> float:
+        """估计 q 分位数（0 <= q <= 1）"""
+        weighted = sorted((value, 1 << level) for level, items in enumerate(self.levels) for value in items)
+        if not weighted:
+            raise ValueError("草图中没有数据")
+        target = q * self.count
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        return weighted[-1][0]
+
+def exact_quantile(sorted_numbers: List[Union[int, float]], q: float) -> float:
+    """在已排序数据上按线性插值计算精确的 q 分位数（q=0.5 时即为中位数）"""
+    position = q * (len(sorted_numbers) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_numbers) - 1)
+    return sorted_numbers[lower] + (sorted_numbers[upper] - sorted_numbers[lower]) * (position - lower)
+
+# 分位数类统计指标及其对应的分位点
+QUANTILE_METRICS = {'MEDIAN': 0.5, 'P50': 0.5, 'P90': 0.9, 'P99': 0.99}
+
+def statistics(*metrics: str, sketch_k: int = 200, exact_limit: int = 100000) -> Callable:
     """
     带参数的统计装饰器，支持多种统计操作
 
+    样本以流的方式逐个处理：SUM、AVG、VAR 等用常数内存的累加量（Welford 算法）计算；
+    分位数指标在数值个数不超过 exact_limit 时精确计算，超过后转为 KLL 草图近似计算，
+    内存占用与数据量无关。
+
     支持的统计操作:
         SUM: 求和
         AVG: 平均值
@@ -110,44 +195,66 @@ def statistics(*metrics: str) -> Callable:
         COUNT: 数值个数
         RANGE: 范围(最大值-最小值)
         MEDIAN: 中位数
+        P50/P90/P99: 50%/90%/99% 分位数
         RMSE: 均方根误差
 
     参数:
         metrics: 统计方法名称列表
+        sketch_k: KLL 草图精度参数，越大误差越小、占用内存越多
+        exact_limit: 精确计算分位数时最多保留的数值个数
 
     返回:
         装饰器函数
     """
     # 验证参数
-    valid_metrics = {'SUM', 'AVG', 'MAX', 'MIN', 'VAR', 'STD', 'COUNT', 'RANGE', 'MEDIAN', 'RMSE'}
+    valid_metrics = {'SUM', 'AVG', 'MAX', 'MIN', 'VAR', 'STD', 'COUNT', 'RANGE', 'RMSE'} | set(QUANTILE_METRICS)
     invalid_metrics = set(metrics) - valid_metrics
     if invalid_metrics:
         raise ValueError(f"不支持的统计方法: {invalid_metrics}")
+    need_quantiles = any(m in QUANTILE_METRICS for m in metrics)
 
     # 装饰器工厂函数
     def decorator(func: Callable) -> Callable:
         # 装饰器包装函数
-        def wrapper(*args, ​**kwargs) -> Dict[str, Union[float, int]]:
-            # 1. 执行生成器函数，收集样本
-            samples = list(func(*args, ​**kwargs))
-
-            # 2. 提取数值数据
-            all_numbers = []
-            for sample in samples:
-                all_numbers.extend(extract_numbers(sample))
+        def wrapper(*args, **kwargs) -> Dict[str, Union[float, int]]:
+            # 1. 逐个处理生成器产生的样本，只维护累加量
+            count = 0
+            total = 0
+            mean = 0.0
+            squared_diffs = 0.0
+            maximum = minimum = None
+            exact_numbers = [] if need_quantiles else None
+            sketch = None
+
+            for sample in func(*args, **kwargs):
+                # 2. 提取数值数据并更新统计量
+                for x in extract_numbers(sample):
+                    count += 1
+                    total += x
+                    delta = x - mean
+                    mean += delta / count
+                    squared_diffs += delta * (x - mean)
+                    if maximum is None or x > maximum:
+                        maximum = x
+                    if minimum is None or x < minimum:
+                        minimum = x
+                    if exact_numbers is not None:
+                        exact_numbers.append(x)
+                        if len(exact_numbers) > exact_limit:
+                            # 数据量超出精确计算的上限，转入分位数草图
+                            sketch = KLLSketch(sketch_k)
+                            sketch.extend(exact_numbers)
+                            exact_numbers = None
+                    elif sketch is not None:
+                        sketch.update(x)
 
             # 3. 计算结果
             results = {}
 
-            if not all_numbers:
+            if count == 0:
                 print("警告: 未提取到数值型数据，无法进行统计计算")
                 return results
 
-            # 计算基础统计量
-            total = sum(all_numbers)
-            count = len(all_numbers)
-            sorted_numbers = sorted(all_numbers)
-
             # 计算需要的统计量
             if 'SUM' in metrics:
                 results['SUM'] = total
@@ -156,38 +263,37 @@ def statistics(*metrics: str) -> Callable:
                 results['COUNT'] = count
 
             if 'AVG' in metrics:
-                results['AVG'] = total / count if count > 0 else 0
+                results['AVG'] = total / count
 
             if 'MAX' in metrics:
-                results['MAX'] = max(all_numbers) if all_numbers else 0
+                results['MAX'] = maximum
 
             if 'MIN' in metrics:
-                results['MIN'] = min(all_numbers) if all_numbers else 0
+                results['MIN'] = minimum
 
             if 'RANGE' in metrics and 'MAX' in metrics and 'MIN' in metrics:
                 results['RANGE'] = results['MAX'] - results['MIN']
 
             # 计算方差和标准差
-            if any(m in metrics for m in ['VAR', 'STD', 'RMSE']) or 'AVG' in metrics:
-                mean = results['AVG'] if 'AVG' in metrics else total / count
-                squared_diffs = sum((x - mean) ​** 2 for x in all_numbers)
-
-                if 'VAR' in metrics:
-                    results['VAR'] = squared_diffs / count if count > 0 else 0
-
-                if 'STD' in metrics:
-                    results['STD'] = math.sqrt(results.get('VAR', squared_diffs / count)) if count > 0 else 0
-
-                if 'RMSE' in metrics:
-                    results['RMSE'] = math.sqrt(squared_diffs / count) if count > 0 else 0
-
-            # 计算中位数
-            if 'MEDIAN' in metrics:
-                if count % 2 == 0:
-                    mid = count // 2
-                    results['MEDIAN'] = (sorted_numbers[mid - 1] + sorted_numbers[mid]) / 2
-                else:
-                    results['MEDIAN'] = sorted_numbers[count // 2]
+            if 'VAR' in metrics:
+                results['VAR'] = squared_diffs / count
+
+            if 'STD' in metrics:
+                results['STD'] = math.sqrt(squared_diffs / count)
+
+            if 'RMSE' in metrics:
+                results['RMSE'] = math.sqrt(squared_diffs / count)
+
+            # 计算中位数和分位数
+            if need_quantiles:
+                sorted_numbers = sorted(exact_numbers) if exact_numbers is not None else None
+                for metric in metrics:
+                    if metric in QUANTILE_METRICS:
+                        q = QUANTILE_METRICS[metric]
+                        if sorted_numbers is not None:
+                            results[metric] = exact_quantile(sorted_numbers, q)
+                        else:
+                            results[metric] = sketch.quantile(q)
 
             return results
 
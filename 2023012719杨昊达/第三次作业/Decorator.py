@@ -11,8 +11,15 @@
 
 import random
 import math
+from functools import reduce
 from typing import Any, Dict, Generator, List, Tuple, Union
 
+# NumPy 只有批量生成（generate_batch）需要，未安装时其余功能照常可用
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 #  数据生成函数
 
@@ -73,6 +80,110 @@ def generate_sample(config: Dict[str, Any]) -> Any:
 
     return TYPE_TO_FUNC[type_name](config)
 
+#  批量（列式）数据生成
+
+
+def batch_column(config: Dict[str, Any], n: int, rng: 'np.random.Generator') -> Any:
+    """
+    按配置一次性生成 n 个样本的列式数据：
+    叶子字段为长度 n 的 NumPy 数组，list/tuple 为子列的列表，dict 为字段名到子列的字典
+    """
+    type_name = config.get('type')
+    if type_name == 'int':
+        low, high = config['datarange'][0], config['datarange'][1]
+        return rng.integers(low, high, size=n, endpoint=True)
+    if type_name == 'float':
+        low, high = config['datarange'][0], config['datarange'][1]
+        return rng.uniform(low, high, size=n)
+    if type_name == 'str':
+        items = list(config['datarange'])
+        length = config['len']
+        if length == 0:
+            return np.full(n, '')
+        if any(len(item) != 1 for item in items):
+            # datarange 为多字符字符串的列表时（gen_str 同样支持），整项抽取后按列依次拼接
+            picked = rng.choice(np.array(items), size=(n, length))
+            return reduce(np.char.add, picked.T)
+        # 一次抽取 (n, len) 的字符下标矩阵，再把每行的 len 个 U1 字符按内存视图合并为一个 U{len} 字符串
+        chars = np.array(items)
+        picked = chars[rng.integers(0, len(chars), size=(n, length))]
+        return np.ascontiguousarray(picked).view(f'<U{length}').reshape(n)
+    if type_name in ('list', 'tuple'):
+        return [batch_column(item, n, rng) for item in config['elements']]
+    if type_name == 'dict':
+        return {key: batch_column(field, n, rng) for key, field in config['fields'].items()}
+    if type_name is None:
+        raise ValueError(f"配置必须包含 'type' 键：{config}")
+    raise ValueError(f"不支持的类型：'{type_name}'")
+
+def batch_rows(config: Dict[str, Any], column: Any, start: int, stop: int) -> list:
+    """把列式数据中 [start, stop) 范围的样本还原为与 generate_sample 相同结构的 Python 对象"""
+    type_name = config['type']
+    count = stop - start
+    if type_name in ('int', 'float', 'str'):
+        return column[start:stop].tolist()
+    if type_name == 'dict':
+        keys = list(config['fields'])
+        if not keys:
+            return [{} for _ in range(count)]
+        values = [batch_rows(config['fields'][key], column[key], start, stop) for key in keys]
+        return [dict(zip(keys, row)) for row in zip(*values)]
+    children = [batch_rows(item, col, start, stop) for item, col in zip(config['elements'], column)]
+    if not children:
+        return [[] if type_name == 'list' else () for _ in range(count)]
+    if type_name == 'list':
+        return [list(row) for row in zip(*children)]
+    return list(zip(*children))
+
+class SampleBatch:
+    """
+    批量生成的样本集合
+
+    数据按列存放在 columns 中；只有在迭代或下标访问时才按块还原为行对象，
+    避免为每个标量单独创建 Python 对象。
+    """
+
+    # 迭代时每次还原的行数
+    chunk_size = 65536
+
+    def __init__(self, config: Dict[str, Any], columns: Any, n: int):
+        self.config = config
+        self.columns = columns
+        self.n = n
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += self.n
+        if not 0 <= index < self.n:
+            raise IndexError("样本下标越界")
+        return batch_rows(self.config, self.columns, index, index + 1)[0]
+
+    def __iter__(self):
+        for start in range(0, self.n, self.chunk_size):
+            yield from batch_rows(self.config, self.columns, start, min(start + self.chunk_size, self.n))
+
+def generate_batch(config: Dict[str, Any], n: int, seed: Union[int, None] = None) -> SampleBatch:
+    """
+    批量生成 n 个随机样本（列式模式）。
+
+    每个叶子字段用 NumPy Generator 一次抽取全部 n 个值，适合生成上亿条的测试数据。
+
+    参数:
+        config: 与 generate_sample 相同的结构配置
+        n: 样本数量
+        seed: 随机种子，相同种子得到相同结果
+
+    返回:
+        SampleBatch，columns 属性为列式数组，迭代时按需还原为行
+    """
+    if np is None:
+        raise ImportError("批量生成需要安装 NumPy: pip install numpy")
+    rng = np.random.default_rng(seed)
+    return SampleBatch(config, batch_column(config, n, rng), n)
+
 def extract_numbers(data: Any) -> List[Union[int, float]]:
     """
     递归提取数据结构中的所有数值（整数和浮点数）
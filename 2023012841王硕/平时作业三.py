@@ -38,37 +38,40 @@ def DataGenerator(**config):
     """
     数据生成器函数，根据配置生成不同类型的数据
     支持的数据类型：整数、浮点数、字符串、字典、列表和元组
+    配置项 rng 为随机数生成器，默认使用 random 模块的全局生成器；传入 random.Random(seed) 可复现结果，
+    需要密码学安全的随机数时显式传入 random.SystemRandom()
     """
     count = config.get('num', 1)
+    rng = config.get('rng') or random
     results = []
 
     for _ in range(count):
         current_sample = []
         for data_type, settings in config.items():
             # 跳过计数参数
-            if data_type == 'num':
+            if data_type in ('num', 'rng'):
                 continue
 
             if data_type == "integer":
                 start, end = settings['range']
-                current_sample.append(random.randint(start, end))
+                current_sample.append(rng.randint(start, end))
 
             elif data_type == "float":
                 start, end = settings['range']
-                current_sample.append(random.uniform(start, end))
+                current_sample.append(rng.uniform(start, end))
 
             elif data_type == "string":
                 chars = settings['characters']
                 length = settings['length']
-                current_sample.append(''.join(random.choices(chars, k=length)))
+                current_sample.append(''.join(rng.choices(chars, k=length)))
 
             elif data_type == "dictionary":
-                key = ''.join(random.choices(string.ascii_letters, k=3))
-                value = random.randint(0, 100)
+                key = ''.join(rng.choices(string.ascii_letters, k=3))
+                value = rng.randint(0, 100)
                 current_sample.append({key: value})
 
             elif data_type in ("list", "tuple"):
-                nested_data = DataGenerator(**settings)
+                nested_data = DataGenerator(rng=rng, **settings)
                 current_sample.append(nested_data if data_type == "list" else tuple(nested_data))
 
         # 格式化输出根据请求的数据量
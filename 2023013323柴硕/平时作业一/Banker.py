@@ -1,7 +1,7 @@
 import ProcSecurity
 
 class BankersAlgorithm:
-    def __init__(self, total_resources, processes):
+    def __init__(self, total_resources, processes, incremental=False):
         """
         初始化银行家算法系统
         :param total_resources: 总资源向量，如[10,5,7] 
@@ -10,13 +10,19 @@ class BankersAlgorithm:
             'max': [7,5,3], 
             'alloc': [0,1,0]
         }]
+        :param incremental: 增量模式，原地维护可用资源向量并复用上一次的安全序列，
+            适合高频请求场景；该模式下不再每次打印资源状态
         """
         self.total = total_resources
         self.processes = processes
         self.n_res = len(total_resources)
+        self.incremental = incremental
+        # 上一次确认安全时的安全序列（进程号），增量模式下用于快速判定和热启动
+        self._safe_pids = []
         
         self.max = [p['max'] for p in processes]
-        self.alloc = [p['alloc'] for p in processes]
+        # 复制各行：增量模式会原地修改分配矩阵，不能改动调用方传入的数据
+        self.alloc = [list(p['alloc']) for p in processes]
         self.need = [
             [self.max[i][j] - self.alloc[i][j] 
              for j in range(self.n_res)]
@@ -33,6 +39,9 @@ class BankersAlgorithm:
         if not self._validate_request(pid, request):
             return False, []
 
+        if self.incremental:
+            return self._request_incremental(pid, request)
+
         temp_alloc = [row.copy() for row in self.alloc]
         temp_need = [row.copy() for row in self.need]
         temp_available = self.available.copy()
@@ -53,6 +62,54 @@ class BankersAlgorithm:
         else:
             return False, []
 
+    def _request_incremental(self, pid, request):
+        """
+        增量模式下处理已通过校验的请求：
+        先用上一次的安全序列快速判定，判定不了再以该序列为热启动做完整检测
+        """
+        if self._still_safe(pid, request):
+            self._apply(pid, request, 1)
+            return True, [f"P{p}" for p in self._safe_pids]
+
+        # 原地试分配，检测不安全时回滚，避免复制整个矩阵
+        self._apply(pid, request, 1)
+        checker = ProcSecurity.SafetyChecker(self.available, self.alloc, self.need, copy=False)
+        is_safe, seq = checker.check(order=self._safe_pids)
+        if is_safe:
+            self._safe_pids = checker.pids
+            return True, seq
+        self._apply(pid, request, -1)
+        return False, []
+
+    def _still_safe(self, pid, request):
+        """
+        判断上一次的安全序列在分配 request 后是否仍然有效。
+        分配后只有 pid 之前的进程可用资源少了 request；pid 完成后
+        可用资源与原序列在该位置完全相同，所以只需检查序列中 pid 及其之前的进程。
+        pid 恰好排在序列首位时只比较一次即可确认安全。
+        """
+        if not self._safe_pids:
+            return False
+        work = [self.available[i] - request[i] for i in range(self.n_res)]
+        for p in self._safe_pids:
+            need = self.need[p]
+            if p == pid:
+                return all(need[i] - request[i] <= work[i] for i in range(self.n_res))
+            if any(need[i] > work[i] for i in range(self.n_res)):
+                return False
+            alloc = self.alloc[p]
+            for i in range(self.n_res):
+                work[i] += alloc[i]
+        return False
+
+    def _apply(self, pid, request, sign):
+        """按 sign（1 分配 / -1 回滚）原地更新已分配、需求和可用资源"""
+        for i in range(self.n_res):
+            delta = sign * request[i]
+            self.alloc[pid][i] += delta
+            self.need[pid][i] -= delta
+            self.available[i] -= delta
+
     def _validate_request(self, pid, request):
         if pid < 0 or pid >= len(self.processes):
             raise ValueError("无效进程ID")
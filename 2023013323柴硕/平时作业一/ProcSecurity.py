@@ -1,34 +1,46 @@
 class SafetyChecker:
-    def __init__(self, available, allocation, need):
+    def __init__(self, available, allocation, need, copy=True):
         """
         初始化安全检测器
         :param available: 可用资源向量
         :param allocation: 已分配资源矩阵
         :param need: 需求资源矩阵
+        :param copy: 是否复制输入矩阵；检测过程不修改矩阵，调用方保证检测期间不改动时可传 False
         """
         self.available = available.copy()
-        self.allocation = [row.copy() for row in allocation]
-        self.need = [row.copy() for row in need]
+        self.allocation = [row.copy() for row in allocation] if copy else allocation
+        self.need = [row.copy() for row in need] if copy else need
         self.n_process = len(allocation)
         self.n_res = len(available)
+        self.pids = []
 
-    def check(self):
+    def check(self, order=None):
         """
         执行安全检测算法
+        :param order: 优先尝试的进程顺序（如上一次的安全序列），用于热启动；默认按进程号顺序
         返回：(是否安全状态, 安全序列)
         """
         work = self.available.copy()
         finish = [False] * self.n_process
         sequence = []
+        self.pids = []
+        if order is None:
+            order = range(self.n_process)
+        else:
+            # 补上 order 中没有的进程，保证所有进程都被考虑
+            order = list(order)
+            seen = set(order)
+            order += [pid for pid in range(self.n_process) if pid not in seen]
 
         for _ in range(self.n_process):
             found = False
-            for pid in range(self.n_process):
+            for pid in order:
                 if not finish[pid] and self.canExec(pid, work):
                     for i in range(self.n_res):
                         work[i] += self.allocation[pid][i]
                     finish[pid] = True
                     sequence.append(f"P{pid}")
+                    self.pids.append(pid)
                     found = True
                     break
             if not found:
@@ -61,20 +61,57 @@ class XMLTreeNode:
             child.print_tree(indent + 1)
 
 
+class ElementView:
+    """传给处理函数的轻量元素视图"""
+
+    __slots__ = ('tag', 'text', 'level', 'path', 'attrib')
+
+    def __init__(self, tag=None, text=None, level=0, path="", attrib=None):
+        self.tag = tag
+        self.text = text
+        self.level = level
+        self.path = path
+        self.attrib = attrib if attrib is not None else {}
+
+
+class PathStatistics:
+    """单个标签路径的聚合统计：出现次数、层次、文本长度"""
+
+    __slots__ = ('count', 'level', 'text_count', 'text_total', 'text_max')
+
+    def __init__(self, level):
+        self.count = 0
+        self.level = level
+        self.text_count = 0
+        self.text_total = 0
+        self.text_max = 0
+
+    def add_text(self, length):
+        """记录一次非空文本的长度"""
+        self.text_count += 1
+        self.text_total += length
+        if length > self.text_max:
+            self.text_max = length
+
+
 class largeXMLDealer:
     """改装后的largeXMLDealer装饰器类"""
 
-    def __init__(self, fileName, elemTag=None):
+    def __init__(self, fileName, elemTag=None, summary=False):
         """
         初始化装饰器
         Args:
             fileName: XML文件名
             elemTag: 目标元素标签，如果为None则处理所有元素
+            summary: 摘要模式，不构建XML树，只保留按路径聚合的计数、层次和文本长度统计，
+                     内存占用只与不同路径的数量有关
         """
         self.fileName = fileName
         self.elemTag = elemTag
+        self.summary = summary
         self.root_node = None
         self.tag_hierarchy = defaultdict(set)
+        self.path_stats = {}
         self.element_count = 0
         self.max_level = 0
 
@@ -109,6 +146,9 @@ class largeXMLDealer:
         # 构建完整的目标标签
         full_target_tag = f"{ns_prefix}{elemTag}" if elemTag else None
 
+        if self.summary:
+            return self._parse_summary(fileName, ns_prefix, full_target_tag, func4Element)
+
         try:
             # 使用start和end事件来构建树
             context = etree.iterparse(fileName, events=('start', 'end'))
@@ -146,15 +186,9 @@ class largeXMLDealer:
                             if func4Element:
                                 try:
                                     # 创建兼容的元素对象
-                                    class CompatElement:
-                                        def __init__(self, node, elem):
-                                            self.tag = node.tag
-                                            self.text = node.text
-                                            self.level = node.level
-                                            self.path = node.path
-                                            self.attrib = dict(elem.attrib) if elem.attrib else {}
-
-                                    compat_elem = CompatElement(current_node, elem)
+                                    compat_elem = ElementView(current_node.tag, current_node.text,
+                                                              current_node.level, current_node.path,
+                                                              dict(elem.attrib) if elem.attrib else {})
                                     func4Element(compat_elem)
                                 except Exception as e:
                                     print(f"处理元素时出错: {e}")
@@ -188,6 +222,71 @@ class largeXMLDealer:
 
         return count
 
+    def _parse_summary(self, fileName, ns_prefix, full_target_tag, func4Element):
+        """
+        摘要模式解析：只维护当前路径栈和按路径聚合的统计，不创建树节点。
+        所有处理函数调用共用同一个 ElementView，处理函数如需保留数据应自行复制。
+        """
+        count = 0
+        view = ElementView()
+        path_stack = []
+
+        try:
+            context = etree.iterparse(fileName, events=('start', 'end'))
+
+            for event, elem in context:
+                if event == 'start':
+                    clean_tag = elem.tag.replace(ns_prefix, '') if ns_prefix else elem.tag
+                    current_level = len(path_stack)
+                    current_path = f"{path_stack[-1]}/{clean_tag}" if path_stack else clean_tag
+                    path_stack.append(current_path)
+                    self.max_level = max(self.max_level, current_level)
+
+                    stats = self.path_stats.get(current_path)
+                    if stats is None:
+                        stats = self.path_stats[current_path] = PathStatistics(current_level)
+                    stats.count += 1
+
+                    # 记录层次关系
+                    if current_level > 0:
+                        parent_tag = path_stack[-2].rsplit('/', 1)[-1]
+                        self.tag_hierarchy[parent_tag].add(clean_tag)
+
+                elif path_stack:
+                    current_path = path_stack.pop()
+                    text = elem.text.strip() if elem.text and elem.text.strip() else None
+                    if text:
+                        self.path_stats[current_path].add_text(len(text))
+
+                    # 如果是目标标签或处理所有标签
+                    if not full_target_tag or elem.tag == full_target_tag:
+                        count += 1
+                        self.element_count += 1
+
+                        if func4Element:
+                            try:
+                                view.tag = current_path.rsplit('/', 1)[-1]
+                                view.text = text
+                                view.level = len(path_stack)
+                                view.path = current_path
+                                view.attrib = dict(elem.attrib) if elem.attrib else {}
+                                func4Element(view)
+                            except Exception as e:
+                                print(f"处理元素时出错: {e}")
+
+                    # 清理内存
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+
+            del context
+
+        except Exception as e:
+            print(f"解析XML时出错: {e}")
+            raise e
+
+        return count
+
     def _getNamespace(self, fileName):
         """获取XML命名空间"""
         if not path.isfile(fileName) or not fileName.endswith("xml"):
@@ -217,9 +316,16 @@ class largeXMLDealer:
         for parent, children in self.tag_hierarchy.items():
             print(f"  {parent} -> {', '.join(sorted(children))}")
 
-        print("\n完整树结构:")
-        if self.root_node:
-            self.root_node.print_tree()
+        if self.summary:
+            print("\n路径统计 (路径: 次数, 层次, 有文本次数, 平均/最大文本长度):")
+            for element_path, stats in self.path_stats.items():
+                average = stats.text_total / stats.text_count if stats.text_count else 0
+                print(f"  {element_path}: {stats.count}, L{stats.level}, {stats.text_count}, "
+                      f"{average:.1f}/{stats.text_max}")
+        else:
+            print("\n完整树结构:")
+            if self.root_node:
+                self.root_node.print_tree()
         print("=" * 50)
 
 
@@ -244,6 +350,12 @@ if __name__ == "__main__":
         print(f"[L{elem.level}] {elem.tag}: {elem.text if elem.text else '(无文本)'}")
 
 
+    # 示例4: 摘要模式，只统计各路径的计数、层次和文本长度
+    @largeXMLDealer("P00734.xml", summary=True)
+    def dealwithElement_summary(elem):
+        pass
+
+
     # 根据命令行参数选择执行
     if len(sys.argv) > 1:
         mode = sys.argv[1].lower()
@@ -256,8 +368,11 @@ if __name__ == "__main__":
         elif mode == "all":
             print("=== 处理所有标签 ===")
             dealwithElement_all()
+        elif mode == "summary":
+            print("=== 摘要统计 ===")
+            dealwithElement_summary()
         else:
-            print("用法: python largeXMLDealer_decorator.py [accession|sequence|all]")
+            print("用法: python largeXMLDealer_decorator.py [accession|sequence|all|summary]")
     else:
         print("默认执行accession模式")
         dealwithElement_accession()
@@ -267,4 +382,5 @@ if __name__ == "__main__":
    python largeXMLDealer.py accession
    python largeXMLDealer.py sequence
    python largeXMLDealer.py all
+   python largeXMLDealer.py summary
 """
\ No newline at end of file